@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Benchmark de A*: implementación actual frente a la original
+#
+# Uso: python -m benchmarks.astar_bench [--queries N] [--seed S]
+
+import argparse
+import random
+import time
+from src.ai.astar import astar
+from src.level_generator import LevelGenerator
+from benchmarks.legacy_astar import legacy_astar
+
+# Pisos a medir: los de la torre y algunos más grandes para ver la tendencia
+FLOORS = [0, 2, 4, 8, 16]
+
+def make_queries(walkable_tiles, count, rng):
+    """Genera pares (inicio, objetivo) reproducibles sobre tiles caminables"""
+    return [(rng.choice(walkable_tiles), rng.choice(walkable_tiles)) for _ in range(count)]
+
+def time_queries(search, queries, grid):
+    """Ejecuta todas las consultas y devuelve (segundos, longitudes de camino)"""
+    lengths = []
+    start = time.perf_counter()
+    for start_tile, goal_tile in queries:
+        path = search(start_tile, goal_tile, grid)
+        lengths.append(None if path is None else len(path))
+    return time.perf_counter() - start, lengths
+
+def run(queries_per_floor=200, seed=1234):
+    random.seed(seed)
+    rng = random.Random(seed)
+    generator = LevelGenerator()
+
+    print(f"{'piso':>5} {'tamaño':>8} {'original (ms)':>14} {'actual (ms)':>12} {'mejora':>8} {'más cortos':>11}")
+    for floor_number in FLOORS:
+        level_map, walkable_tiles = generator.generate_floor(floor_number)
+        queries = make_queries(walkable_tiles, queries_per_floor, rng)
+
+        legacy_time, legacy_lengths = time_queries(legacy_astar, queries, level_map)
+        new_time, new_lengths = time_queries(astar, queries, level_map)
+
+        # La versión original puede devolver caminos más largos de lo óptimo
+        # (no reinserta nodos abiertos cuando mejora su coste), nunca más cortos
+        shorter = 0
+        for legacy_length, new_length in zip(legacy_lengths, new_lengths):
+            if (legacy_length is None) != (new_length is None):
+                raise AssertionError(f"Resultados de alcanzabilidad distintos en el piso {floor_number}")
+            if legacy_length is not None:
+                if new_length > legacy_length:
+                    raise AssertionError(f"Camino más largo que el original en el piso {floor_number}")
+                if new_length < legacy_length:
+                    shorter += 1
+
+        size = f"{len(level_map[0])}x{len(level_map)}"
+        print(f"{floor_number:>5} {size:>8} {legacy_time * 1000:>14.1f} {new_time * 1000:>12.1f} "
+              f"{legacy_time / max(new_time, 1e-9):>7.1f}x {shorter:>11}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de A* sobre pisos generados")
+    parser.add_argument("--queries", type=int, default=200, help="consultas por piso")
+    parser.add_argument("--seed", type=int, default=1234, help="semilla para los pisos y consultas")
+    args = parser.parse_args()
+    run(args.queries, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Benchmark de blits: imágenes sin convertir, convertidas y subsuperficies del atlas,
+# por separado para los tiles opacos (sobre un fondo como el de Game.draw_tiles) y
+# los sprites con transparencia (sobre la pantalla)
+#
+# Uso: python -m benchmarks.blit_bench [--blits N]
+# (sin ventana: SDL_VIDEODRIVER=dummy python -m benchmarks.blit_bench)
+
+import argparse
+import random
+import time
+import pygame
+from src.game import render_images
+from src.utils.atlas import TextureAtlas, is_opaque, to_display_format
+from src.utils.constants import *
+from src.utils.sprites import SpriteVariants
+
+def measure(target, sources, positions):
+    """
+    Devuelve los blits por segundo dibujando sources en positions (cíclicamente)
+
+    Args:
+        sources: Lista de tuplas (superficie, área); área None dibuja la superficie entera
+    """
+    count = len(sources)
+    start = time.perf_counter()
+    for index, position in enumerate(positions):
+        surface, area = sources[index % count]
+        target.blit(surface, position, area)
+    return len(positions) / (time.perf_counter() - start)
+
+def measure_batched(target, sources, positions):
+    """Como measure(), pero enviando todos los blits en una sola llamada a Surface.blits()"""
+    count = len(sources)
+    sequence = [(sources[index % count][0], position, sources[index % count][1])
+                for index, position in enumerate(positions)]
+    start = time.perf_counter()
+    target.blits(sequence, doreturn=False)
+    return len(positions) / (time.perf_counter() - start)
+
+def run(blits=50000, seed=1234):
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    variants = SpriteVariants(render_images()).variants
+    rng = random.Random(seed)
+    # Los sprites caen en cualquier píxel; los tiles, siempre en la rejilla de TILE_SIZE
+    positions = [(rng.randrange(SCREEN_WIDTH - TILE_SIZE), rng.randrange(SCREEN_HEIGHT - TILE_SIZE))
+                 for _ in range(blits)]
+    tile_positions = [(x * TILE_SIZE, y * TILE_SIZE) for x, y in
+                      ((rng.randrange(SCREEN_WIDTH // TILE_SIZE), rng.randrange(SCREEN_HEIGHT // TILE_SIZE))
+                       for _ in range(blits))]
+
+    atlas = TextureAtlas()
+    packed = atlas.pack(variants)
+    print(f"formato de pantalla: {screen.get_bitsize()} bits")
+
+    # Los tiles se dibujan en el fondo pre-renderizado y los sprites directamente en pantalla
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    groups = [
+        ("tiles opacos sobre el fondo", background, tile_positions,
+         sorted(key for key in variants if is_opaque(variants[key]))),
+        ("sprites con alfa sobre la pantalla", screen, positions,
+         sorted(key for key in variants if not is_opaque(variants[key]))),
+    ]
+    for group, target, group_positions, keys in groups:
+        atlas_sources = [(atlas.pages[key], atlas.rects[key]) for key in keys]
+        cases = [
+            ("sin convertir", measure, [(variants[key], None) for key in keys]),
+            # Todo con canal alfa: como quedaban los tiles en un atlas único
+            ("convert_alpha()", measure, [(to_display_format(variants[key], alpha=True), None) for key in keys]),
+            ("convertidas", measure, [(to_display_format(variants[key], alpha=not is_opaque(variants[key])), None)
+                                      for key in keys]),
+            ("subsuperficies", measure, [(packed[key], None) for key in keys]),
+            ("atlas + área", measure, atlas_sources),
+            ("atlas + blits()", measure_batched, atlas_sources),
+        ]
+
+        print(f"\n{group}: {', '.join(name for name, _ in keys)}")
+        print(f"{'superficies':>16} {'blits/s':>12} {'relativo':>9}")
+        baseline = None
+        for name, function, sources in cases:
+            # Mejor de cinco repeticiones para reducir el ruido
+            rate = max(function(target, sources, group_positions) for _ in range(5))
+            baseline = baseline or rate
+            print(f"{name:>16} {rate:>12.0f} {rate / baseline:>8.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de blits con y sin conversión al formato de pantalla")
+    parser.add_argument("--blits", type=int, default=50000, help="blits por caso")
+    parser.add_argument("--seed", type=int, default=1234, help="semilla para las posiciones")
+    args = parser.parse_args()
+    run(args.blits, args.seed)
+
+if __name__ == "__main__":
+    main()
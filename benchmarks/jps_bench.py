@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# Benchmark de Jump Point Search frente a A* en pisos generados
+#
+# Uso: python -m benchmarks.jps_bench [--queries N] [--seed S]
+
+import argparse
+import random
+import time
+from src.ai import astar as pathfinding
+from src.level_generator import LevelGenerator
+
+FLOORS = [0, 2, 4, 8, 16]
+METHODS = ["astar", "jps", "jps8"]
+
+def measure(method, queries, grid):
+    """Devuelve (segundos, nodos expandidos) para todas las consultas"""
+    pathfinding.reset_stats()
+    start = time.perf_counter()
+    for start_tile, goal_tile in queries:
+        pathfinding.find_path(start_tile, goal_tile, grid, method)
+    return time.perf_counter() - start, pathfinding.stats['expanded']
+
+def run(queries_per_floor=200, seed=1234):
+    random.seed(seed)
+    rng = random.Random(seed)
+    generator = LevelGenerator()
+
+    header = f"{'piso':>5} {'tamaño':>8}"
+    for method in METHODS:
+        header += f" {method + ' (ms)':>12} {method + ' nodos':>12}"
+    print(header)
+
+    for floor_number in FLOORS:
+        level_map, walkable_tiles = generator.generate_floor(floor_number)
+        queries = [(rng.choice(walkable_tiles), rng.choice(walkable_tiles))
+                   for _ in range(queries_per_floor)]
+
+        line = f"{floor_number:>5} {len(level_map[0]):>4}x{len(level_map):<3}"
+        for method in METHODS:
+            elapsed, expanded = measure(method, queries, level_map)
+            line += f" {elapsed * 1000:>12.1f} {expanded:>12}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de Jump Point Search sobre pisos generados")
+    parser.add_argument("--queries", type=int, default=200, help="consultas por piso")
+    parser.add_argument("--seed", type=int, default=1234, help="semilla para los pisos y consultas")
+    args = parser.parse_args()
+    run(args.queries, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# Suite de micro-benchmarks de los puntos calientes del motor
+#
+# Uso: python -m benchmarks.suite [--output resultados.json] [--baseline base.json] [--threshold 0.2]
+#                                 [--case NOMBRE ...] [--repeat N] [--seed S]
+#
+# Cada caso se prepara con una semilla fija, así que dos ejecuciones miden
+# exactamente el mismo trabajo. Con --baseline se comparan las medianas con
+# una ejecución anterior guardada con --output y se sale con código 1 si
+# algún caso es más lento que la base en más de --threshold.
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import pygame
+from src.ai import astar as pathfinding
+from src.enemy import Enemy
+from src.floor_plan import build_floor
+from src.game import Game
+from src.headless import KeyState
+from src.level_generator import LevelGenerator
+from src.player import Player
+from src.utils.clock import SimClock, set_clock
+from src.utils.constants import *
+
+# Registro de casos: nombre -> función setup(seed) que devuelve (step, operaciones por step)
+CASES = {}
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+def make_game(seed, floor=4, enemies=None):
+    """Partida sin ventana en el piso floor con enemies enemigos y un jugador inmortal"""
+    game = Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), rng=random.Random(seed))
+    game.current_floor = floor
+    game.enter_floor(build_floor(floor, seed, game.sprites, game.path_cache, enemies))
+    game.player.health = 10 ** 9
+    return game
+
+@case("astar")
+def setup_astar(seed):
+    random.seed(seed)
+    level_map, walkable_tiles = LevelGenerator().generate_floor(4)
+    rng = random.Random(seed)
+    queries = [(rng.choice(walkable_tiles), rng.choice(walkable_tiles)) for _ in range(50)]
+
+    def step():
+        for start, goal in queries:
+            pathfinding.astar(start, goal, level_map)
+    return step, len(queries)
+
+@case("generate_floor")
+def setup_generate_floor(seed):
+    def step():
+        generator = LevelGenerator(random.Random(seed))
+        for floor_number in range(FLOOR_COUNT):
+            generator.generate_floor(floor_number)
+    return step, FLOOR_COUNT
+
+@case("line_of_sight")
+def setup_line_of_sight(seed):
+    random.seed(seed)
+    level_map, walkable_tiles = LevelGenerator().generate_floor(4)
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(200):
+        ex, ey = rng.choice(walkable_tiles)
+        px, py = rng.choice(walkable_tiles)
+        enemy = Enemy(ex * TILE_SIZE, ey * TILE_SIZE, level_map, walkable_tiles, rng=rng)
+        pairs.append((enemy, Player(px * TILE_SIZE, py * TILE_SIZE)))
+
+    def step():
+        for enemy, player in pairs:
+            enemy.has_line_of_sight(player)
+    return step, len(pairs)
+
+@case("player_update")
+def setup_player_update(seed):
+    random.seed(seed)
+    level_map, walkable_tiles = LevelGenerator().generate_floor(4)
+    rng = random.Random(seed)
+    players = [Player(x * TILE_SIZE, y * TILE_SIZE) for x, y in rng.sample(walkable_tiles, 50)]
+    moves = [KeyState([key]) for key in (pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN)]
+
+    def step():
+        for index, player in enumerate(players):
+            player.update(level_map, walkable_tiles, moves[index % 4])
+    return step, len(players)
+
+def setup_game_update(seed, enemies):
+    game = make_game(seed, enemies=enemies)
+    clock = SimClock()
+    idle = KeyState()
+
+    def step():
+        previous = set_clock(clock)
+        try:
+            game.update(idle)
+            clock.advance()
+        finally:
+            set_clock(previous)
+    return step, 1
+
+@case("game_update_10")
+def setup_game_update_10(seed):
+    return setup_game_update(seed, 10)
+
+@case("game_update_50")
+def setup_game_update_50(seed):
+    return setup_game_update(seed, 50)
+
+@case("enemy_store_2000")
+def setup_enemy_store(seed):
+    # Miles de enemigos (pueden compartir tile) sobre el almacén del piso
+    game = make_game(seed)
+    store = game.enemy_store
+    rng = random.Random(seed)
+    for _ in range(2000):
+        x, y = rng.choice(game.walkable_tiles)
+        Enemy(x * TILE_SIZE, y * TILE_SIZE, game.level_map, game.walkable_tiles, flow_field=game.flow_field,
+              path_cache=game.path_cache, planner=game.planner, visibility=game.visibility, rng=rng, store=store)
+    player_tile = (game.player.rect.centerx // TILE_SIZE, game.player.rect.centery // TILE_SIZE)
+    game.flow_field.update(player_tile)
+    game.visibility.update(player_tile)
+
+    def step():
+        store.update(game.player)
+    return step, 1
+
+@case("game_draw")
+def setup_game_draw(seed):
+    game = make_game(seed)
+    game.draw()
+
+    def step():
+        game.draw()
+    return step, 1
+
+@case("build_background")
+def setup_build_background(seed):
+    # Todos los tiles visibles dibujados en el fondo (al entrar en un piso o saltar la cámara)
+    game = make_game(seed)
+
+    def step():
+        game.build_background()
+    return step, 1
+
+@case("game_draw_full")
+def setup_game_draw_full(seed):
+    game = make_game(seed)
+
+    def step():
+        game.request_full_redraw()
+        game.draw()
+    return step, 1
+
+def measure(setup, seed, repeat, min_time=0.05):
+    """
+    Mide un caso: calibra cuántos steps caben en min_time y repite la medición
+
+    Returns:
+        Diccionario con los tiempos por operación en microsegundos
+    """
+    step, operations = setup(seed)
+    step()  # Calentamiento
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            step()
+        if time.perf_counter() - start >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            step()
+        samples.append((time.perf_counter() - start) / (number * operations) * 1e6)
+
+    return {
+        'median_us': statistics.median(samples),
+        'min_us': min(samples),
+        'max_us': max(samples),
+        'number': number,
+        'operations': operations,
+        'repeat': repeat,
+    }
+
+def compare(results, baseline, threshold):
+    """Imprime la comparación con la base y devuelve los casos que han empeorado"""
+    regressions = []
+    print(f"{'caso':>16} {'base (us)':>12} {'actual (us)':>12} {'cambio':>8}")
+    for name, result in results['cases'].items():
+        base = baseline.get('cases', {}).get(name)
+        if base is None:
+            print(f"{name:>16} {'-':>12} {result['median_us']:>12.2f} {'nuevo':>8}")
+            continue
+        ratio = result['median_us'] / base['median_us']
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  <-- regresión"
+        print(f"{name:>16} {base['median_us']:>12.2f} {result['median_us']:>12.2f} {ratio - 1:>+8.1%}{flag}")
+    return regressions
+
+def run(names=None, repeat=7, seed=1234):
+    pygame.font.init()
+    results = {
+        'meta': {
+            'seed': seed,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+        },
+        'cases': {},
+    }
+    for name in names or CASES:
+        results['cases'][name] = measure(CASES[name], seed, repeat)
+        result = results['cases'][name]
+        print(f"{name:>16} {result['median_us']:>12.2f} us/op (min {result['min_us']:.2f}, {result['number']}x{repeat})")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de los puntos calientes del motor")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="caso a medir (por defecto todos)")
+    parser.add_argument("--repeat", type=int, default=7, help="repeticiones de cada medición")
+    parser.add_argument("--seed", type=int, default=1234, help="semilla para preparar los casos")
+    parser.add_argument("--output", help="guardar los resultados en este JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.2, help="empeoramiento tolerado (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = run(args.case, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regresiones: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
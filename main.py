@@ -3,9 +3,15 @@
 
 import pygame
 import sys
-from src.game import Game
+import time
+from src.loader import GameLoader
 from src.ui.menu import Menu
-from src.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS
+from src.ui.text_cache import TextCache
+from src.utils.profiler import profiler
+from src.utils.tracer import tracer
+from src.utils.clock import SimClock, set_clock
+from src.utils.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS, DIRTY_RECT_RENDERING, TRACE_ON_START,
+                                 SIM_STEP_MS, MAX_SIM_STEPS_PER_FRAME, RENDER_INTERPOLATION)
 
 def main():
     # Inicializar pygame
@@ -17,24 +23,68 @@ def main():
     pygame.display.set_caption(TITLE)
     clock = pygame.time.Clock()
     
-    # Crear instancias del juego y el menú
-    game = Game(screen)
-    menu = Menu(screen, game)
+    # La simulación avanza a pasos fijos de SIM_STEP_MS con su propio reloj, así que los
+    # temporizadores (por frames o por tiempo) no dependen de cuántos frames se rendericen.
+    # Se instala antes de crear el juego para que todo use el mismo reloj
+    sim_clock = SimClock(SIM_STEP_MS)
+    set_clock(sim_clock)
+    
+    # Mostrar el menú al instante y crear el juego en segundo plano
+    text_cache = TextCache()
+    loader = GameLoader(screen, text_cache)
+    loader.start()
+    game = None
+    menu = Menu(screen, loader, text_cache)
+    
+    # Traza de spans: F4 empieza a grabar y, pulsado de nuevo, la guarda
+    if TRACE_ON_START:
+        tracer.start()
+    
+    accumulator = 0.0  # Tiempo real pendiente de simular, en milisegundos
+    last_time = time.perf_counter()
     
     # Estado inicial
     current_state = "menu"
+    drawn_state = None  # Estado dibujado en el frame anterior
     
     # Bucle principal
     running = True
     while running:
+        # Cerrar las mediciones del frame anterior (solo con el perfilador activo, F3)
+        profiler.frame()
+        tracer.frame()
+        
+        now = time.perf_counter()
+        accumulator += (now - last_time) * 1000
+        last_time = now
+        
+        # Recoger el juego cuando termine de cargarse
+        if game is None:
+            game = loader.poll()
+        
         # Gestionar eventos
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                if tracer.enabled:
+                    tracer.stop()
+                    tracer.dump()
+                    tracer.clear()
+                else:
+                    tracer.start()
+                continue
+            
             # Pasar eventos al estado actual
             if current_state == "menu":
                 new_state = menu.handle_event(event)
+                if new_state == "game" and game is None:
+                    # El hilo de carga puede haber terminado después del poll() de este frame:
+                    # solo se entra al juego con el Game ya recogido aquí
+                    game = loader.poll()
+                    if game is None:
+                        new_state = None
                 if new_state:
                     current_state = new_state
             elif current_state == "game":
@@ -48,34 +98,72 @@ def main():
                         game.reset()
                     current_state = new_state
         
-        # Actualizar
-        if current_state == "menu":
-            menu.update()
-        elif current_state == "game":
-            game_state = game.update()
-            if game_state == "game_over":
-                current_state = "game_over"
-            elif game_state == "victory":
-                current_state = "victory"
-        elif current_state == "game_over":
-            menu.update_game_over()
-        elif current_state == "victory":
-            menu.update_victory()
+        # Actualizar: tantos pasos fijos como quepan en el tiempo acumulado
+        steps = 0
+        with profiler.section("update"):
+            while accumulator >= SIM_STEP_MS and steps < MAX_SIM_STEPS_PER_FRAME:
+                if current_state == "menu":
+                    menu.update()
+                elif current_state == "game":
+                    game_state = game.update()
+                    if game_state == "game_over":
+                        current_state = "game_over"
+                    elif game_state == "victory":
+                        current_state = "victory"
+                elif current_state == "game_over":
+                    menu.update_game_over()
+                elif current_state == "victory":
+                    menu.update_victory()
+                sim_clock.advance()
+                accumulator -= SIM_STEP_MS
+                steps += 1
+        profiler.count("pasos", steps)
+        
+        # Si la máquina no da para recuperar el retraso, descartarlo: el juego va más
+        # lento en lugar de encadenar frames cada vez más largos
+        if steps == MAX_SIM_STEPS_PER_FRAME and accumulator >= SIM_STEP_MS:
+            accumulator = 0.0
+        
+        # Sin pasos nuevos ni interpolación no hay nada nuevo que dibujar
+        if steps == 0 and not RENDER_INTERPOLATION and current_state == drawn_state:
+            with profiler.section("espera"):
+                clock.tick(FPS)
+            continue
         
         # Renderizar
-        screen.fill((0, 0, 0))
+        # Al cambiar de escena (o sin renderizado por rectángulos) se repinta la pantalla entera
+        full_frame = current_state != drawn_state or not DIRTY_RECT_RENDERING
+        if full_frame:
+            screen.fill((0, 0, 0))
+            if current_state == "game":
+                game.request_full_redraw()
+        drawn_state = current_state
         
-        if current_state == "menu":
-            menu.draw()
-        elif current_state == "game":
-            game.draw()
-        elif current_state == "game_over":
-            menu.draw_game_over()
-        elif current_state == "victory":
-            menu.draw_victory()
+        changed_rects = None
+        with profiler.section("draw"):
+            if current_state == "menu":
+                changed_rects = menu.draw()
+            elif current_state == "game":
+                # Fracción del paso en curso ya transcurrida, para dibujar las entidades entre dos pasos
+                alpha = accumulator / SIM_STEP_MS if RENDER_INTERPOLATION else 1.0
+                changed_rects = game.draw(alpha)
+            elif current_state == "game_over":
+                changed_rects = menu.draw_game_over()
+            elif current_state == "victory":
+                changed_rects = menu.draw_victory()
         
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Presentar solo lo que ha cambiado; volcado completo como alternativa
+        with profiler.section("presentar"):
+            if full_frame or changed_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(changed_rects)
+        with profiler.section("espera"):
+            clock.tick(FPS)
+    
+    # Guardar la traza que estuviera grabándose
+    if tracer.enabled:
+        tracer.dump()
     
     pygame.quit()
     sys.exit()
@@ -1,5 +1,8 @@
 import os
 import pygame
+from src.game import render_images
+from src.utils.asset_bundle import save_asset_bundle, source_key
+from src.utils.constants import ASSET_BUNDLE
 
 # Crear estructura de carpetas
 folders = [
@@ -34,4 +37,8 @@ for name, (width, height, color) in images.items():
     pygame.image.save(surface, f"assets/images/{name}")
     print(f"Creada imagen: assets/images/{name}")
 
+# Pre-renderizar las imágenes del juego en el paquete de assets para no rasterizarlas al arrancar
+save_asset_bundle(ASSET_BUNDLE, render_images(), source_key(render_images))
+print(f"Creado paquete de imágenes: {ASSET_BUNDLE}")
+
 print("¡Configuración completada! Ahora puedes ejecutar el juego.") 
\ No newline at end of file
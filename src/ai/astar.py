@@ -1,85 +1,514 @@
 import heapq
+from src.level_grid import LevelGrid
+from src.utils.tracer import tracer
 from src.utils.constants import *
 
+SQRT2 = 2 ** 0.5
+
+# Contadores acumulados de búsqueda (útiles para benchmarks y perfiles)
+stats = {
+    'searches': 0,
+    'expanded': 0
+}
+
+def reset_stats():
+    """Pone a cero los contadores de búsqueda"""
+    for key in stats:
+        stats[key] = 0
+
+def flatten_grid(grid):
+    """
+    Convierte la matriz 2D del mapa en un bytearray plano rodeado por un borde de paredes
+
+    El borde evita comprobar los límites del mapa al visitar vecinos: el tile
+    (x, y) está en cells[(y + 1) * (width + 2) + x + 1].
+
+    Args:
+        grid: LevelGrid o matriz 2D que representa el mapa (1 = pared, 0 = suelo)
+
+    Returns:
+        Tupla (cells, width, height) con las dimensiones del mapa sin el borde
+    """
+    # Un LevelGrid ya guarda esta copia en caché
+    if isinstance(grid, LevelGrid):
+        return grid.padded_cells()
+
+    height = len(grid)
+    width = len(grid[0]) if height else 0
+    border_row = b'\x01' * (width + 2)
+    cells = bytearray(border_row)
+    for row in grid:
+        cells.append(1)
+        cells.extend(row)
+        cells.append(1)
+    cells.extend(border_row)
+    return cells, width, height
+
+@tracer.traced("astar", "ai")
 def astar(start, goal, grid):
     """
     Implementación del algoritmo A* para encontrar el camino más corto entre dos puntos
-    
+
+    Los nodos se identifican con un entero plano sobre el mapa con borde, el
+    coste g se guarda en una lista indexada por ese entero y el conjunto abierto
+    es un heap con borrado perezoso: las entradas obsoletas se descartan al
+    extraerlas en lugar de buscarlas dentro del heap.
+
     Args:
         start: Tupla (x, y) con la posición inicial en coordenadas de tile
         goal: Tupla (x, y) con la posición objetivo en coordenadas de tile
         grid: Matriz 2D que representa el mapa (1 = pared, 0 = suelo)
-    
+
     Returns:
         Lista de tuplas (x, y) que representan el camino desde start hasta goal,
         o None si no se encuentra un camino
     """
-    # Conjunto de nodos abiertos y cerrados
-    open_set = []
-    closed_set = set()
-    
-    # Diccionarios para almacenar el costo g y el padre de cada nodo
-    g_score = {start: 0}
-    parent = {}
-    
-    # Función heurística (distancia Manhattan)
-    def heuristic(a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-    
-    # Agregar el nodo inicial al conjunto abierto
-    heapq.heappush(open_set, (0, start))
-    
+    cells, width, height = flatten_grid(grid)
+    stride = width + 2
+
+    sx, sy = start
+    gx, gy = goal
+
+    # Descartar extremos fuera del mapa o un objetivo dentro de una pared
+    if not (0 <= sx < width and 0 <= sy < height):
+        return None
+    if not (0 <= gx < width and 0 <= gy < height):
+        return None
+
+    start_id = (sy + 1) * stride + sx + 1
+    goal_id = (gy + 1) * stride + gx + 1
+    if cells[goal_id] == 1:
+        return None
+
+    stats['searches'] += 1
+
+    if start_id == goal_id:
+        return []
+
+    size = len(cells)
+    g_score = [-1] * size  # -1 = nodo no descubierto
+    parent = [-1] * size
+    closed = bytearray(size)
+
+    g_score[start_id] = 0
+    h = abs(sx - gx) + abs(sy - gy)
+
+    # Entradas (f, h, nodo): a igual f se prefiere el nodo más cercano al
+    # objetivo, lo que reduce mucho las expansiones en salas abiertas
+    open_set = [(h, h, start_id)]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    # 4 direcciones: abajo, derecha, arriba, izquierda
+    directions = ((stride, 0, 1), (1, 1, 0), (-stride, 0, -1), (-1, -1, 0))
+    # Coordenadas del objetivo en el mapa con borde
+    gx += 1
+    gy += 1
+    expanded = 0
+
     while open_set:
-        # Obtener el nodo con menor f_score
-        _, current = heapq.heappop(open_set)
-        
-        # Si llegamos al objetivo, reconstruir el camino
-        if current == goal:
-            path = []
-            while current in parent:
-                path.append(current)
-                current = parent[current]
-            return path[::-1]  # Invertir el camino para que vaya desde start hasta goal
-        
-        # Agregar el nodo actual al conjunto cerrado
-        closed_set.add(current)
-        
-        # Explorar vecinos
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # 4 direcciones: abajo, derecha, arriba, izquierda
-            neighbor = (current[0] + dx, current[1] + dy)
-            
-            # Comprobar si el vecino está dentro de los límites del mapa
-            if (0 <= neighbor[1] < len(grid) and 
-                0 <= neighbor[0] < len(grid[0])):
-                
-                # Comprobar si el vecino es una pared
-                if grid[neighbor[1]][neighbor[0]] == 1:
-                    continue
-                
-                # Comprobar si el vecino ya está en el conjunto cerrado
-                if neighbor in closed_set:
-                    continue
-                
-                # Calcular el costo g tentativo
-                tentative_g = g_score[current] + 1
-                
-                # Comprobar si el vecino ya está en el conjunto abierto
-                in_open_set = False
-                for _, node in open_set:
-                    if node == neighbor:
-                        in_open_set = True
-                        break
-                
-                # Si el vecino no está en el conjunto abierto o el nuevo camino es mejor
-                if not in_open_set or tentative_g < g_score.get(neighbor, float('inf')):
-                    # Este camino es mejor, guardar
-                    parent[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic(neighbor, goal)
-                    
-                    # Agregar o actualizar el vecino en el conjunto abierto
-                    if not in_open_set:
-                        heapq.heappush(open_set, (f_score, neighbor))
-    
+        _, _, current = heappop(open_set)
+
+        # Entrada obsoleta (borrado perezoso)
+        if closed[current]:
+            continue
+
+        if current == goal_id:
+            stats['expanded'] += expanded
+            return _reconstruct_path(parent, current, start_id, stride)
+
+        closed[current] = 1
+        expanded += 1
+
+        cy, cx = divmod(current, stride)
+        tentative_g = g_score[current] + 1
+
+        for offset, dx, dy in directions:
+            neighbor = current + offset
+
+            # Paredes (incluido el borde) y nodos ya cerrados
+            if cells[neighbor] == 1 or closed[neighbor]:
+                continue
+
+            known_g = g_score[neighbor]
+            if known_g != -1 and known_g <= tentative_g:
+                continue
+
+            g_score[neighbor] = tentative_g
+            parent[neighbor] = current
+            h = abs(cx + dx - gx) + abs(cy + dy - gy)
+            heappush(open_set, (tentative_g + h, h, neighbor))
+
     # No se encontró un camino
-    return None 
\ No newline at end of file
+    stats['expanded'] += expanded
+    return None
+
+def _reconstruct_path(parent, current, start_id, stride):
+    """Reconstruye el camino (sin incluir el inicio) a partir de los padres"""
+    path = []
+    while current != start_id:
+        y, x = divmod(current, stride)
+        path.append((x - 1, y - 1))
+        current = parent[current]
+    path.reverse()  # Invertir el camino para que vaya desde start hasta goal
+    return path
+
+@tracer.traced("jump_point_search", "ai")
+def jump_point_search(start, goal, grid, diagonal=False):
+    """
+    Jump Point Search: A* que salta en línea recta por las zonas abiertas
+
+    En lugar de añadir cada vecino al conjunto abierto, avanza en cada
+    dirección hasta encontrar un punto de salto (el objetivo o un tile con
+    vecinos forzados por una pared), de modo que las salas rectangulares se
+    cruzan con muy pocas expansiones. La variante de 8 direcciones no permite
+    cortar esquinas: un paso diagonal exige que los dos tiles ortogonales
+    estén libres. Los saltos rectos se leen de la JumpTable del mapa.
+
+    Args:
+        start: Tupla (x, y) con la posición inicial en coordenadas de tile
+        goal: Tupla (x, y) con la posición objetivo en coordenadas de tile
+        grid: Matriz 2D que representa el mapa (1 = pared, 0 = suelo)
+        diagonal: Si es True se permiten movimientos en diagonal
+
+    Returns:
+        Lista de tuplas (x, y) con todos los tiles del camino desde start
+        (excluido) hasta goal, o None si no se encuentra un camino
+    """
+    cells, width, height = flatten_grid(grid)
+    stride = width + 2
+
+    sx, sy = start
+    gx, gy = goal
+
+    if not (0 <= sx < width and 0 <= sy < height):
+        return None
+    if not (0 <= gx < width and 0 <= gy < height):
+        return None
+
+    start_id = (sy + 1) * stride + sx + 1
+    goal_id = (gy + 1) * stride + gx + 1
+    if cells[goal_id] == 1:
+        return None
+
+    stats['searches'] += 1
+
+    if start_id == goal_id:
+        return []
+
+    table = jump_table(cells, width, height)
+    if diagonal:
+        jump = table.jump_diagonal
+        successors = _successors_diagonal
+        heuristic = _octile
+    else:
+        jump = table.jump_orthogonal
+        successors = _successors_orthogonal
+        heuristic = _manhattan
+
+    # Mismas estructuras planas que astar(): -1 = nodo no descubierto / sin padre
+    size = len(cells)
+    g_score = [-1] * size
+    parent = [-1] * size
+    closed = bytearray(size)
+
+    g_score[start_id] = 0
+    h = heuristic(sx, sy, gx, gy)
+    open_set = [(h, h, start_id)]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    expanded = 0
+
+    while open_set:
+        _, _, current = heappop(open_set)
+
+        # Entrada obsoleta (borrado perezoso)
+        if closed[current]:
+            continue
+
+        if current == goal_id:
+            stats['expanded'] += expanded
+            return _expand_jump_points(parent, current, start_id, stride)
+
+        closed[current] = 1
+        expanded += 1
+
+        cy, cx = divmod(current, stride)
+        current_parent = parent[current]
+        if current_parent != -1:
+            py, px = divmod(current_parent, stride)
+            dx = (cx > px) - (cx < px)
+            dy = (cy > py) - (cy < py)
+        else:
+            dx = dy = 0
+        current_g = g_score[current]
+
+        for ndx, ndy in successors(cells, stride, current, dx, dy):
+            jump_point = jump(current, ndx, ndy, goal_id)
+            if jump_point < 0 or closed[jump_point]:
+                continue
+
+            jy, jx = divmod(jump_point, stride)
+            tentative_g = current_g + heuristic(cx, cy, jx, jy)
+            known_g = g_score[jump_point]
+            if known_g != -1 and known_g <= tentative_g:
+                continue
+
+            g_score[jump_point] = tentative_g
+            parent[jump_point] = current
+            h = heuristic(jx, jy, gx + 1, gy + 1)
+            heappush(open_set, (tentative_g + h, h, jump_point))
+
+    # No se encontró un camino
+    stats['expanded'] += expanded
+    return None
+
+def find_path(start, goal, grid, method=PATHFINDING_METHOD):
+    """
+    Punto de entrada común para elegir el algoritmo de búsqueda
+
+    Args:
+        start: Tupla (x, y) con la posición inicial en coordenadas de tile
+        goal: Tupla (x, y) con la posición objetivo en coordenadas de tile
+        grid: Matriz 2D que representa el mapa (1 = pared, 0 = suelo)
+        method: "astar", "jps" (4 direcciones) o "jps8" (8 direcciones)
+
+    Returns:
+        Lista de tuplas (x, y) desde start (excluido) hasta goal, o None
+    """
+    if method == "astar":
+        return astar(start, goal, grid)
+    if method == "jps":
+        return jump_point_search(start, goal, grid)
+    if method == "jps8":
+        return jump_point_search(start, goal, grid, diagonal=True)
+    raise ValueError(f"Unknown pathfinding method: {method}")
+
+def _manhattan(x1, y1, x2, y2):
+    return abs(x1 - x2) + abs(y1 - y2)
+
+def _octile(x1, y1, x2, y2):
+    dx = abs(x1 - x2)
+    dy = abs(y1 - y2)
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+def _successors_orthogonal(cells, stride, node, dx, dy):
+    """Direcciones a explorar desde node según la dirección de llegada (dx, dy)"""
+    if dx:
+        # Llegando en horizontal: seguir recto y probar arriba y abajo
+        return ((dx, 0), (0, -1), (0, 1))
+    if dy:
+        return ((0, dy), (-1, 0), (1, 0))
+    return ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+def _successors_diagonal(cells, stride, node, dx, dy):
+    """Direcciones a explorar en 8 direcciones sin cortar esquinas"""
+    if dx and dy:
+        directions = []
+        vertical_open = cells[node + dy * stride] == 0
+        horizontal_open = cells[node + dx] == 0
+        if vertical_open:
+            directions.append((0, dy))
+        if horizontal_open:
+            directions.append((dx, 0))
+        if vertical_open and horizontal_open:
+            directions.append((dx, dy))
+        return directions
+
+    if dx:
+        directions = []
+        next_open = cells[node + dx] == 0
+        for side in (-1, 1):
+            if cells[node + side * stride] == 0:
+                directions.append((0, side))
+                if next_open:
+                    directions.append((dx, side))
+        if next_open:
+            directions.append((dx, 0))
+        return directions
+
+    if dy:
+        directions = []
+        next_open = cells[node + dy * stride] == 0
+        for side in (-1, 1):
+            if cells[node + side] == 0:
+                directions.append((side, 0))
+                if next_open:
+                    directions.append((side, dy))
+        if next_open:
+            directions.append((0, dy))
+        return directions
+
+    # Nodo inicial: todas las direcciones que no corten esquinas
+    directions = []
+    for ndx, ndy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+        if cells[node + ndx + ndy * stride] == 0:
+            directions.append((ndx, ndy))
+    for ndx, ndy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+        if cells[node + ndx] == 0 and cells[node + ndy * stride] == 0:
+            directions.append((ndx, ndy))
+    return directions
+
+class JumpTable:
+    """
+    Saltos rectos de Jump Point Search precalculados para un mapa
+
+    Para cada tile y dirección recta guarda hasta dónde llega el salto (el
+    último tile que examina antes de una pared o de un vecino forzado) y el
+    punto de salto en que se detiene (-1 si choca con una pared). Con eso
+    cada salto recto es una consulta en lugar de un recorrido tile a tile;
+    lo único que depende de la búsqueda es el objetivo, que se comprueba
+    mirando si cae dentro del tramo recorrido. Se calcula una vez por mapa
+    (ver jump_table()).
+    """
+    def __init__(self, cells, width, height):
+        self.cells = cells
+        self.stride = stride = width + 2
+        size = len(cells)
+
+        # Horizontales: último tile examinado y punto de salto hacia la derecha / izquierda
+        self.right_stop = [-1] * size
+        self.right_jump = [-1] * size
+        self.left_stop = [-1] * size
+        self.left_jump = [-1] * size
+        for dx, stop, jump, columns in ((1, self.right_stop, self.right_jump, range(width, 0, -1)),
+                                        (-1, self.left_stop, self.left_jump, range(1, width + 1))):
+            for y in range(1, height + 1):
+                base = y * stride
+                for x in columns:
+                    node = base + x
+                    following = node + dx
+                    if cells[following] == 1:
+                        stop[node] = node
+                    elif (cells[following - stride] == 0 and cells[node - stride] == 1) or \
+                            (cells[following + stride] == 0 and cells[node + stride] == 1):
+                        stop[node] = jump[node] = following
+                    else:
+                        stop[node] = stop[following]
+                        jump[node] = jump[following]
+
+        # Verticales: el salto de 8 direcciones solo para en vecinos forzados; el de 4
+        # direcciones también donde empieza un salto horizontal (jump_orthogonal)
+        self.down_stop = [-1] * size
+        self.down_jump = [-1] * size
+        self.down_jump_orthogonal = [-1] * size
+        self.up_stop = [-1] * size
+        self.up_jump = [-1] * size
+        self.up_jump_orthogonal = [-1] * size
+        right_jump = self.right_jump
+        left_jump = self.left_jump
+        for step, stop, jump, jump_orthogonal, rows in (
+                (stride, self.down_stop, self.down_jump, self.down_jump_orthogonal, range(height, 0, -1)),
+                (-stride, self.up_stop, self.up_jump, self.up_jump_orthogonal, range(1, height + 1))):
+            for y in rows:
+                base = y * stride
+                for x in range(1, width + 1):
+                    node = base + x
+                    following = node + step
+                    if cells[following] == 1:
+                        stop[node] = node
+                        continue
+                    if (cells[following - 1] == 0 and cells[node - 1] == 1) or \
+                            (cells[following + 1] == 0 and cells[node + 1] == 1):
+                        stop[node] = jump[node] = jump_orthogonal[node] = following
+                        continue
+                    stop[node] = stop[following]
+                    jump[node] = jump[following]
+                    if right_jump[following] >= 0 or left_jump[following] >= 0:
+                        jump_orthogonal[node] = following
+                    else:
+                        jump_orthogonal[node] = jump_orthogonal[following]
+
+    def horizontal(self, node, dx, goal_id):
+        """Salto horizontal desde node; el objetivo cuenta si está en el tramo recorrido"""
+        if dx > 0:
+            if node < goal_id <= self.right_stop[node]:
+                return goal_id
+            return self.right_jump[node]
+        if self.left_stop[node] <= goal_id < node:
+            return goal_id
+        return self.left_jump[node]
+
+    def vertical(self, node, dy, goal_id, orthogonal=False):
+        """
+        Salto vertical desde node
+
+        Con orthogonal=True (4 direcciones) también para en el tile de la fila
+        del objetivo si desde él un salto horizontal llega al objetivo.
+        """
+        stride = self.stride
+        # Tile de esta columna en la fila del objetivo
+        candidate = node + (goal_id // stride - node // stride) * stride
+        if dy > 0:
+            jump = (self.down_jump_orthogonal if orthogonal else self.down_jump)[node]
+            reached = node < candidate <= self.down_stop[node] and (jump < 0 or candidate <= jump)
+        else:
+            jump = (self.up_jump_orthogonal if orthogonal else self.up_jump)[node]
+            reached = self.up_stop[node] <= candidate < node and (jump < 0 or candidate >= jump)
+        if reached:
+            if candidate == goal_id:
+                return candidate
+            if orthogonal and (candidate < goal_id <= self.right_stop[candidate] or
+                               self.left_stop[candidate] <= goal_id < candidate):
+                return candidate
+        return jump
+
+    def jump_orthogonal(self, node, dx, dy, goal_id):
+        """Punto de salto en 4 direcciones desde node en la dirección (dx, dy); -1 si no hay"""
+        if dx:
+            return self.horizontal(node, dx, goal_id)
+        return self.vertical(node, dy, goal_id, orthogonal=True)
+
+    def jump_diagonal(self, node, dx, dy, goal_id):
+        """Punto de salto en 8 direcciones sin cortar esquinas; -1 si no hay"""
+        if not (dx and dy):
+            if dx:
+                return self.horizontal(node, dx, goal_id)
+            return self.vertical(node, dy, goal_id)
+
+        cells = self.cells
+        vertical_step = dy * self.stride
+        step = dx + vertical_step
+        while True:
+            node += step
+            if cells[node] == 1:
+                return -1
+            if node == goal_id:
+                return node
+            # Un punto diagonal es de salto si alguno de sus saltos rectos lo es
+            if self.horizontal(node, dx, goal_id) >= 0 or self.vertical(node, dy, goal_id) >= 0:
+                return node
+            # Solo se continúa en diagonal si no se corta ninguna esquina
+            if cells[node + dx] == 1 or cells[node + vertical_step] == 1:
+                return -1
+
+# Tabla de saltos del último mapa usado (los mapas de LevelGrid se reutilizan mientras no cambien)
+_jump_tables = {}
+
+def jump_table(cells, width, height):
+    """Devuelve la JumpTable del mapa aplanado, calculándola solo si el mapa ha cambiado"""
+    key = bytes(cells) if isinstance(cells, bytearray) else cells
+    table = _jump_tables.get(key)
+    if table is None:
+        _jump_tables.clear()
+        table = _jump_tables[key] = JumpTable(cells, width, height)
+    return table
+
+def _expand_jump_points(parent, current, start_id, stride):
+    """Reconstruye el camino completo rellenando los tramos entre puntos de salto"""
+    jump_points = []
+    while current != start_id:
+        jump_points.append(current)
+        current = parent[current]
+    jump_points.reverse()
+
+    path = []
+    y, x = divmod(start_id, stride)
+    for node in jump_points:
+        ty, tx = divmod(node, stride)
+        dx = (tx > x) - (tx < x)
+        dy = (ty > y) - (ty < y)
+        while x != tx or y != ty:
+            x += dx
+            y += dy
+            path.append((x - 1, y - 1))
+    return path
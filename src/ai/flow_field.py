@@ -0,0 +1,109 @@
+from collections import deque
+from src.ai.astar import flatten_grid
+from src.utils.constants import *
+
+class FlowField:
+    """
+    Mapa de Dijkstra (campo de flujo) hacia un único objetivo
+
+    Se recalcula con una búsqueda en anchura desde el objetivo cada vez que
+    éste cambia de tile. Para cada tile alcanzable se guarda el siguiente tile
+    del camino más corto hacia el objetivo, de modo que cualquier número de
+    enemigos puede consultar su próximo paso en O(1).
+    """
+    def __init__(self, level_map):
+        self.cells, self.width, self.height = flatten_grid(level_map)
+        self.stride = self.width + 2
+        self.goal = None
+        # next_step[nodo] = nodo vecino más cercano al objetivo (-1 = inalcanzable)
+        self.next_step = [-1] * len(self.cells)
+        self.distance = [-1] * len(self.cells)
+
+    def _node(self, tile):
+        x, y = tile
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (y + 1) * self.stride + x + 1
+        return -1
+
+    def update(self, goal):
+        """
+        Recalcula el campo hacia goal si ha cambiado desde la última llamada
+
+        Args:
+            goal: Tupla (x, y) con el tile objetivo
+
+        Returns:
+            True si se ha recalculado el campo, False si ya estaba al día
+        """
+        if goal == self.goal:
+            return False
+        self.goal = goal
+
+        size = len(self.cells)
+        next_step = [-1] * size
+        distance = [-1] * size
+        self.next_step = next_step
+        self.distance = distance
+
+        goal_id = self._node(goal)
+        if goal_id < 0 or self.cells[goal_id] == 1:
+            return True
+
+        cells = self.cells
+        stride = self.stride
+        offsets = (stride, 1, -stride, -1)
+
+        next_step[goal_id] = goal_id
+        distance[goal_id] = 0
+        queue = deque([goal_id])
+        popleft = queue.popleft
+        append = queue.append
+
+        while queue:
+            current = popleft()
+            current_distance = distance[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] == 1 or distance[neighbor] != -1:
+                    continue
+                distance[neighbor] = current_distance
+                # Desde el vecino, el paso hacia el objetivo es el nodo actual
+                next_step[neighbor] = current
+                append(neighbor)
+
+        return True
+
+    def get_next_tile(self, tile):
+        """
+        Devuelve el siguiente tile hacia el objetivo desde tile
+
+        Args:
+            tile: Tupla (x, y) con la posición actual en coordenadas de tile
+
+        Returns:
+            Tupla (x, y) del siguiente tile, el propio tile si ya es el objetivo,
+            o None si el objetivo no es alcanzable desde tile
+        """
+        node = self._node(tile)
+        if node < 0:
+            return None
+        if self.cells[node] == 1:
+            # Dentro de una pared: salir por el vecino más cercano al objetivo
+            step = -1
+            for neighbor in (node + self.stride, node + 1, node - self.stride, node - 1):
+                neighbor_distance = self.distance[neighbor]
+                if neighbor_distance >= 0 and (step < 0 or neighbor_distance < self.distance[step]):
+                    step = neighbor
+        else:
+            step = self.next_step[node]
+        if step < 0:
+            return None
+        y, x = divmod(step, self.stride)
+        return (x - 1, y - 1)
+
+    def get_distance(self, tile):
+        """Devuelve la distancia en tiles hasta el objetivo, o None si es inalcanzable"""
+        node = self._node(tile)
+        if node < 0 or self.distance[node] < 0:
+            return None
+        return self.distance[node]
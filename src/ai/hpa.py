@@ -0,0 +1,345 @@
+import heapq
+from collections import deque
+from src.ai.astar import astar, flatten_grid
+from src.level_grid import zero_indices
+from src.utils.constants import *
+
+class RoomGraph:
+    """
+    Grafo abstracto de habitaciones y portales de un piso
+
+    Cada tile caminable pertenece a una región: la primera habitación que lo
+    contiene o, si no está en ninguna, el componente de pasillo al que
+    pertenece. Donde dos regiones se tocan hay una entrada; de cada tramo
+    continuo de frontera se toma un portal (el par de tiles central). Los
+    portales de una misma región se unen con aristas cuyo coste es la
+    distancia dentro de la región. Para cada portal se guarda el árbol BFS de
+    su región, de modo que las distancias a cualquier tile de la región y los
+    caminos locales se obtienen sin volver a buscar.
+
+    Los nodos se identifican con el mismo id plano que usa astar() sobre el
+    mapa con borde: (y + 1) * (ancho + 2) + x + 1.
+    """
+    def __init__(self, level_map, rooms):
+        self.cells, self.width, self.height = flatten_grid(level_map)
+        self.stride = self.width + 2
+        self.rooms = list(rooms)
+        # Nodos caminables en orden: los recorridos por todo el mapa se limitan a ellos
+        self.walkable_nodes = zero_indices(self.cells)
+
+        # region[nodo] = índice de región (-1 para paredes y borde)
+        self.region = [-1] * len(self.cells)
+        self.region_count = 0
+        # Nodos portal de cada región
+        self.portals = {}
+        # Aristas del grafo abstracto: nodo -> {vecino: coste}
+        self.edges = {}
+        # Árbol BFS de cada portal dentro de su región: nodo -> (distancias, padres)
+        self.portal_trees = {}
+
+        self._assign_regions()
+        self._find_portals()
+        self._link_portals()
+
+    def tile_to_node(self, tile):
+        x, y = tile
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (y + 1) * self.stride + x + 1
+        return -1
+
+    def node_to_tile(self, node):
+        y, x = divmod(node, self.stride)
+        return (x - 1, y - 1)
+
+    def region_at(self, tile):
+        """Devuelve la región del tile o -1 si es una pared o está fuera del mapa"""
+        node = self.tile_to_node(tile)
+        return self.region[node] if node >= 0 else -1
+
+    def _assign_regions(self):
+        cells = self.cells
+        region = self.region
+        stride = self.stride
+
+        # Habitaciones, en el orden en que se generaron
+        for index, (x, y, room_width, room_height) in enumerate(self.rooms):
+            for row in range(y, y + room_height):
+                base = (row + 1) * stride + 1
+                for node in range(base + x, base + x + room_width):
+                    if region[node] == -1 and cells[node] == 0:
+                        region[node] = index
+        self.region_count = len(self.rooms)
+
+        # Pasillos: componentes conexos de tiles caminables fuera de las habitaciones
+        offsets = (stride, 1, -stride, -1)
+        for node in self.walkable_nodes:
+            if region[node] != -1:
+                continue
+            corridor = self.region_count
+            self.region_count += 1
+            region[node] = corridor
+            queue = deque([node])
+            while queue:
+                current = queue.popleft()
+                for offset in offsets:
+                    neighbor = current + offset
+                    if cells[neighbor] == 0 and region[neighbor] == -1:
+                        region[neighbor] = corridor
+                        queue.append(neighbor)
+
+    def _find_portals(self):
+        region = self.region
+        stride = self.stride
+
+        # Agrupar los pares frontera por (región A, región B, dirección, línea)
+        borders = {}
+        for node in self.walkable_nodes:
+            region_a = region[node]
+            for offset, axis in ((1, 'x'), (stride, 'y')):
+                region_b = region[node + offset]
+                if region_b == -1 or region_b == region_a:
+                    continue
+                y, x = divmod(node, stride)
+                # Línea de la frontera y posición a lo largo de ella
+                line, position = (x, y) if axis == 'x' else (y, x)
+                borders.setdefault((region_a, region_b, axis, line), []).append((position, node, node + offset))
+
+        for pairs in borders.values():
+            pairs.sort()
+            run = [pairs[0]]
+            for pair in pairs[1:]:
+                if pair[0] == run[-1][0] + 1:
+                    run.append(pair)
+                else:
+                    self._add_entrance(run)
+                    run = [pair]
+            self._add_entrance(run)
+
+    def _add_entrance(self, run):
+        _, node_a, node_b = run[len(run) // 2]
+        for node in (node_a, node_b):
+            self.portals.setdefault(self.region[node], set()).add(node)
+            self.edges.setdefault(node, {})
+        self.edges[node_a][node_b] = 1
+        self.edges[node_b][node_a] = 1
+
+    def _link_portals(self):
+        for nodes in self.portals.values():
+            for node in nodes:
+                self.portal_trees[node] = self.region_tree(node)
+            for node in nodes:
+                distances = self.portal_trees[node][0]
+                for other in nodes:
+                    if other != node and other in distances:
+                        cost = distances[other]
+                        if cost < self.edges[node].get(other, cost + 1):
+                            self.edges[node][other] = cost
+
+    def region_tree(self, source):
+        """Árbol BFS desde source sin salir de su región: (distancias, padres)"""
+        cells_region = self.region
+        region_index = cells_region[source]
+        offsets = (self.stride, 1, -self.stride, -1)
+        distances = {source: 0}
+        parents = {}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cells_region[neighbor] == region_index and neighbor not in distances:
+                    distances[neighbor] = next_distance
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return distances, parents
+
+    def region_path(self, source, target):
+        """
+        Camino más corto entre dos nodos de la misma región sin salir de ella
+
+        Returns:
+            Lista de nodos desde source (excluido) hasta target, o None
+        """
+        region = self.region
+        region_index = region[source]
+        if region[target] != region_index:
+            return None
+
+        # Si alguno de los extremos es un portal basta con recorrer su árbol
+        if source in self.portal_trees:
+            distances, parents = self.portal_trees[source]
+            if target not in distances:
+                return None
+            path = []
+            while target != source:
+                path.append(target)
+                target = parents[target]
+            path.reverse()
+            return path
+        if target in self.portal_trees:
+            distances, parents = self.portal_trees[target]
+            if source not in distances:
+                return None
+            path = []
+            while source != target:
+                source = parents[source]
+                path.append(source)
+            return path
+
+        offsets = (self.stride, 1, -self.stride, -1)
+        parent = {source: source}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                path = []
+                while current != source:
+                    path.append(current)
+                    current = parent[current]
+                path.reverse()
+                return path
+            for offset in offsets:
+                neighbor = current + offset
+                if region[neighbor] == region_index and neighbor not in parent:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        return None
+
+
+class HierarchicalPlanner:
+    """
+    Planificador jerárquico (HPA*) sobre el grafo de habitaciones de un piso
+
+    Primero busca sobre el grafo abstracto de portales, que solo crece con el
+    número de habitaciones y pasillos, y después refina cada tramo con una
+    búsqueda local limitada a una única región. Los caminos pueden ser algo
+    más largos que los de astar() a cambio de un coste casi constante.
+
+    El grafo (con un árbol BFS por portal) no se construye hasta la primera
+    búsqueda: los enemigos con campo de flujo no lo necesitan nunca.
+    """
+    def __init__(self, level_map, rooms):
+        self.level_map = level_map
+        self.rooms = rooms
+        self._graph = None
+
+    @property
+    def graph(self):
+        """RoomGraph del piso, construido en el primer acceso"""
+        if self._graph is None:
+            self._graph = RoomGraph(self.level_map, self.rooms)
+        return self._graph
+
+    def find_path(self, start, goal, grid=None):
+        """
+        Encuentra un camino entre start y goal con la misma salida que astar()
+
+        Args:
+            start: Tupla (x, y) con la posición inicial en coordenadas de tile
+            goal: Tupla (x, y) con la posición objetivo en coordenadas de tile
+            grid: Ignorado; existe para poder usarse como función de búsqueda
+
+        Returns:
+            Lista de tuplas (x, y) desde start (excluido) hasta goal, o None
+        """
+        graph = self.graph
+        start_node = graph.tile_to_node(start)
+        goal_node = graph.tile_to_node(goal)
+
+        # Extremos fuera de las regiones (p. ej. dentro de una pared): A* normal
+        if start_node < 0 or goal_node < 0:
+            return astar(start, goal, self.level_map)
+        if graph.region[start_node] == -1 or graph.region[goal_node] == -1:
+            return astar(start, goal, self.level_map)
+
+        if start_node == goal_node:
+            return []
+
+        # Misma región: búsqueda local directa
+        if graph.region[start_node] == graph.region[goal_node]:
+            local = graph.region_path(start_node, goal_node)
+            if local is not None:
+                return [graph.node_to_tile(node) for node in local]
+
+        abstract = self._abstract_path(start_node, goal_node)
+        if abstract is None:
+            return None
+
+        # Refinar cada tramo del camino abstracto
+        path = []
+        previous = start_node
+        for node in abstract:
+            if graph.region[previous] != graph.region[node]:
+                segment = [node]  # Cruce de portal: tiles adyacentes
+            else:
+                segment = graph.region_path(previous, node)
+                if segment is None:
+                    return astar(start, goal, self.level_map)
+            path.extend(graph.node_to_tile(step) for step in segment)
+            previous = node
+        return path
+
+    def _portal_distances(self, node):
+        """Distancia desde node hasta cada portal alcanzable de su región"""
+        graph = self.graph
+        distances = {}
+        for portal in graph.portals.get(graph.region[node], ()):
+            portal_distances = graph.portal_trees[portal][0]
+            if node in portal_distances:
+                distances[portal] = portal_distances[node]
+        return distances
+
+    def _abstract_path(self, start_node, goal_node):
+        """Búsqueda A* sobre los portales, conectando temporalmente start y goal"""
+        graph = self.graph
+        stride = graph.stride
+
+        # Aristas temporales desde el inicio hacia los portales de su región
+        start_edges = self._portal_distances(start_node)
+        # Si el inicio es un portal conserva también sus cruces a otras regiones
+        for node, cost in graph.edges.get(start_node, {}).items():
+            start_edges.setdefault(node, cost)
+
+        # Portales de la región del objetivo y su distancia hasta él
+        goal_edges = self._portal_distances(goal_node)
+
+        goal_y, goal_x = divmod(goal_node, stride)
+
+        def heuristic(node):
+            y, x = divmod(node, stride)
+            return abs(x - goal_x) + abs(y - goal_y)
+
+        g_score = {start_node: 0}
+        parent = {}
+        closed = set()
+        open_set = [(heuristic(start_node), start_node)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if current == goal_node:
+                path = []
+                while current != start_node:
+                    path.append(current)
+                    current = parent[current]
+                path.reverse()
+                return path
+            closed.add(current)
+
+            neighbors = start_edges if current == start_node else graph.edges.get(current, {})
+            candidates = list(neighbors.items())
+            if current in goal_edges:
+                candidates.append((goal_node, goal_edges[current]))
+
+            for neighbor, cost in candidates:
+                if neighbor in closed:
+                    continue
+                tentative_g = g_score[current] + cost
+                if tentative_g < g_score.get(neighbor, tentative_g + 1):
+                    g_score[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    heapq.heappush(open_set, (tentative_g + heuristic(neighbor), neighbor))
+
+        return None
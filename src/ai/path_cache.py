@@ -0,0 +1,133 @@
+from array import array
+from collections import OrderedDict
+from src.ai.astar import find_path
+from src.utils.constants import *
+
+class PathCache:
+    """
+    Caché LRU acotada delante de astar()
+
+    Las entradas se indexan por (versión del piso, búsqueda, inicio, objetivo)
+    y guardan el camino como un array compacto de ids planos (y * ancho + x).
+    Cuando no hay entrada exacta se intenta reutilizar un camino ya calculado
+    por la misma búsqueda: todo tramo de un camino más corto es también un
+    camino más corto, así que si el objetivo aparece en un camino cacheado
+    con el mismo inicio (o el inicio en uno con el mismo objetivo) basta con
+    recortarlo. Esto solo vale para búsquedas óptimas; los caminos de las que
+    no lo son (HPA*) se guardan pero no se recortan.
+    """
+    def __init__(self, max_size=PATH_CACHE_SIZE):
+        self.max_size = max_size
+        self.floor_version = 0
+        self.entries = OrderedDict()
+        # Índices auxiliares para la reutilización de subcaminos
+        self.by_start = {}
+        self.by_goal = {}
+
+        # Contadores para dimensionar la caché
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        """Descarta todos los caminos (llamar cuando se reemplaza el mapa)"""
+        self.floor_version += 1
+        self.entries.clear()
+        self.by_start.clear()
+        self.by_goal.clear()
+
+    def get_path(self, start, goal, grid, search=find_path, optimal=True):
+        """
+        Devuelve el camino entre start y goal, calculándolo solo si no está en caché
+
+        Args:
+            start: Tupla (x, y) con la posición inicial en coordenadas de tile
+            goal: Tupla (x, y) con la posición objetivo en coordenadas de tile
+            grid: Matriz 2D que representa el mapa (1 = pared, 0 = suelo)
+            search: Función de búsqueda con la firma de astar() para los fallos
+                (por defecto find_path() con el método configurado)
+            optimal: Si search devuelve siempre caminos más cortos; solo
+                entonces se reutilizan tramos de sus caminos
+
+        Returns:
+            Nueva lista de tuplas (x, y) desde start (excluido) hasta goal,
+            o None si no hay camino
+        """
+        width = len(grid[0])
+        key = (self.floor_version, search, start, goal)
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self._decode(self.entries[key], width)
+
+        if optimal:
+            compact = self._find_subpath(search, start, goal, width)
+            if compact is not None:
+                self.partial_hits += 1
+                self._store(key, compact, optimal)
+                return self._decode(compact, width)
+
+        self.misses += 1
+        path = search(start, goal, grid)
+        if path is None:
+            self._store(key, None, optimal)
+            return None
+        self._store(key, array('i', [y * width + x for x, y in path]), optimal)
+        return list(path)
+
+    def _find_subpath(self, search, start, goal, width):
+        """Busca un camino cacheado de search que contenga el tramo start -> goal"""
+        start_id = start[1] * width + start[0]
+        goal_id = goal[1] * width + goal[0]
+
+        # Mismo inicio y el objetivo está en el camino: quedarse con el prefijo
+        for key in self.by_start.get((search, start), ()):
+            compact = self.entries[key]
+            if compact is not None and goal_id in compact:
+                return compact[:compact.index(goal_id) + 1]
+
+        # Mismo objetivo y el inicio está en el camino: quedarse con el sufijo
+        for key in self.by_goal.get((search, goal), ()):
+            compact = self.entries[key]
+            if compact is not None and start_id in compact:
+                return compact[compact.index(start_id) + 1:]
+
+        return None
+
+    def _store(self, key, compact, optimal):
+        self.entries[key] = compact
+        # Solo los caminos óptimos se indexan para recortarlos después
+        if optimal:
+            self.by_start.setdefault((key[1], key[2]), set()).add(key)
+            self.by_goal.setdefault((key[1], key[3]), set()).add(key)
+
+        # Expulsar la entrada usada hace más tiempo
+        while len(self.entries) > self.max_size:
+            old_key, _ = self.entries.popitem(last=False)
+            self._unindex(self.by_start, (old_key[1], old_key[2]), old_key)
+            self._unindex(self.by_goal, (old_key[1], old_key[3]), old_key)
+
+    def _unindex(self, index, endpoint, key):
+        keys = index.get(endpoint)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[endpoint]
+
+    def _decode(self, compact, width):
+        if compact is None:
+            return None
+        return [(node % width, node // width) for node in compact]
+
+    def get_stats(self):
+        """Devuelve los contadores de aciertos y fallos de la caché"""
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'partial_hits': self.partial_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.partial_hits) / lookups if lookups else 0.0
+        }
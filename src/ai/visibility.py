@@ -0,0 +1,77 @@
+from src.utils.constants import *
+
+class VisibilityMap:
+    """
+    Tabla de líneas de visión hacia el jugador
+
+    Se recalcula solo cuando el jugador cambia de tile y se guarda como un
+    mapa de bits sobre el mapa del piso: para cada tile alrededor del
+    jugador, si la línea de Bresenham desde ese tile hasta el del jugador
+    está libre de paredes. Es exactamente la comprobación de
+    Enemy.has_line_of_sight() (misma dirección, mismos tiles), así que saber
+    si un enemigo ve al jugador se reduce a consultar el tile del enemigo.
+    """
+    def __init__(self, level_map, radius=None):
+        self.level_map = level_map
+        self.width = level_map.width
+        self.height = level_map.height
+        # Radio en tiles: cubre el radio de detección desde cualquier punto del tile
+        self.radius = radius if radius is not None else ENEMY_DETECTION_RADIUS // TILE_SIZE + 2
+        self.origin = None
+        self.visible = bytearray(self.width * self.height)
+
+    def update(self, origin):
+        """
+        Recalcula la tabla hacia origin si ha cambiado
+
+        Args:
+            origin: Tupla (x, y) con el tile del jugador
+
+        Returns:
+            True si se ha recalculado, False si ya estaba al día
+        """
+        if origin == self.origin:
+            return False
+        self.origin = origin
+        self.visible = bytearray(self.width * self.height)
+
+        end_x, end_y = origin
+        if not (0 <= end_x < self.width and 0 <= end_y < self.height):
+            return True
+
+        cells = self.level_map.cells
+        visible = self.visible
+        width = self.width
+        radius = self.radius
+        end = end_y * width + end_x
+
+        # Las líneas no salen del rectángulo entre sus extremos, así que todo queda dentro del mapa
+        for start_y in range(max(0, end_y - radius), min(self.height, end_y + radius + 1)):
+            dy = abs(end_y - start_y)
+            step_y = width if start_y < end_y else -width
+            for start_x in range(max(0, end_x - radius), min(width, end_x + radius + 1)):
+                # Bresenham desde el tile del enemigo (incluido) hasta el del jugador (excluido)
+                dx = abs(end_x - start_x)
+                step_x = 1 if start_x < end_x else -1
+                err = dx - dy
+                index = start_y * width + start_x
+                while index != end:
+                    if cells[index] == 1:
+                        break
+                    e2 = 2 * err
+                    if e2 > -dy:
+                        err -= dy
+                        index += step_x
+                    if e2 < dx:
+                        err += dx
+                        index += step_y
+                else:
+                    visible[start_y * width + start_x] = 1
+        return True
+
+    def is_visible(self, tile):
+        """True si desde tile se ve el origen actual"""
+        x, y = tile
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.visible[y * self.width + x] == 1
+        return False
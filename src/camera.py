@@ -0,0 +1,81 @@
+import pygame
+from src.utils.constants import *
+
+class Camera:
+    """
+    Ventana de la pantalla sobre el mundo que sigue al jugador
+
+    Guarda el desplazamiento (x, y) en píxeles de la esquina superior
+    izquierda de la pantalla dentro del piso. El desplazamiento se recorta a
+    los límites del piso, de modo que en pisos más pequeños que la pantalla
+    se queda en (0, 0) y el mapa se dibuja igual que sin cámara.
+
+    Todo el dibujado del mundo pasa por apply() para convertir coordenadas
+    del mundo a coordenadas de pantalla, y tile_window() da el rango de tiles
+    que hay que recorrer, que depende del tamaño de la pantalla y no del piso.
+    """
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+        self.world_width = width
+        self.world_height = height
+
+    def set_world(self, world_width, world_height):
+        """Cambia el tamaño del mundo en píxeles (al generar un piso nuevo)"""
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x, self.y = self._clamp(self.x, self.y)
+
+    def _clamp(self, x, y):
+        x = max(0, min(x, self.world_width - self.width))
+        y = max(0, min(y, self.world_height - self.height))
+        return x, y
+
+    def follow(self, rect):
+        """
+        Centra la cámara en rect sin salirse del mundo
+
+        Args:
+            rect: pygame.Rect en coordenadas del mundo (normalmente el jugador)
+
+        Returns:
+            True si el desplazamiento ha cambiado
+        """
+        x, y = self._clamp(rect.centerx - self.width // 2, rect.centery - self.height // 2)
+        if (x, y) == (self.x, self.y):
+            return False
+        self.x = x
+        self.y = y
+        return True
+
+    @property
+    def rect(self):
+        """Zona visible del mundo en coordenadas del mundo"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def apply(self, rect):
+        """Convierte un rectángulo del mundo a coordenadas de pantalla"""
+        return pygame.Rect(rect.x - self.x, rect.y - self.y, rect.width, rect.height)
+
+    def apply_pos(self, pos):
+        """Convierte una posición (x, y) del mundo a coordenadas de pantalla"""
+        return (pos[0] - self.x, pos[1] - self.y)
+
+    def is_visible(self, rect):
+        """True si rect (en coordenadas del mundo) se ve en pantalla"""
+        return (rect.right > self.x and rect.left < self.x + self.width and
+                rect.bottom > self.y and rect.top < self.y + self.height)
+
+    def tile_window(self):
+        """
+        Rango de tiles visibles
+
+        Returns:
+            Tupla (x1, y1, x2, y2) con los tiles visibles, ambos extremos
+            incluidos (puede salirse del mapa si el piso es más pequeño que la
+            pantalla; quien recorre el rango lo recorta)
+        """
+        return (self.x // TILE_SIZE, self.y // TILE_SIZE,
+                (self.x + self.width - 1) // TILE_SIZE, (self.y + self.height - 1) // TILE_SIZE)
@@ -2,20 +2,50 @@ import pygame
 import random
 import math
 from src.ai.behavior_tree import *
-from src.ai.astar import astar
+from src.ai.astar import find_path
+from src.utils.render_queue import RenderQueue, LAYER_ENEMIES
+from src.utils.sprites import health_bar
+from src.utils import clock
+from src.utils.tracer import tracer
+from src.enemy_store import EnemyStore
 from src.utils.constants import *
 
 class Enemy:
-    def __init__(self, x, y, level_map, walkable_tiles, image=None):
+    """
+    Enemigo: vista sobre una fila de un EnemyStore
+    
+    Salud, velocidad, estado, punto de patrulla, camino y temporizadores se
+    guardan en las columnas del almacén (compartido por todos los enemigos del
+    piso); rect refleja la posición de la fila. Sin store se crea un almacén
+    propio de un solo enemigo.
+    """
+    def __init__(self, x, y, level_map, walkable_tiles, image=None, flow_field=None, path_cache=None,
+                 planner=None, visibility=None, rng=None, store=None):
+        if store is None:
+            store = EnemyStore(level_map, flow_field, visibility)
         self.rect = pygame.Rect(x, y, ENEMY_SIZE, ENEMY_SIZE)
-        self.health = 50
-        self.speed = ENEMY_SPEED
+        self.store = store
+        self.index = store.add(self, self.rect.x, self.rect.y)
         self.level_map = level_map
         self.walkable_tiles = walkable_tiles
-        self.state = "patrol"
-        self.patrol_point = None
-        self.path = []
-        self.last_path_update = 0
+        
+        # Resto del camino A* tras el siguiente tile (que se guarda en el almacén)
+        self.path_rest = []
+        
+        # Generador aleatorio para la patrulla (el de la partida si se indica)
+        self.rng = rng if rng is not None else random
+        
+        # Campo de flujo compartido hacia el jugador (si el piso lo proporciona)
+        self.flow_field = flow_field
+        
+        # Caché de caminos compartida para las búsquedas A*
+        self.path_cache = path_cache
+        
+        # Planificador jerárquico del piso (si no hay, se usa A* directamente)
+        self.planner = planner
+        
+        # Campo de visión del jugador compartido (si no hay, se traza la línea de visión)
+        self.visibility = visibility
         
         # Imagen del enemigo
         self.image = image
@@ -26,6 +56,82 @@ class Enemy:
         # Crear árbol de comportamiento
         self.behavior_tree = self.create_behavior_tree()
     
+    # Atributos guardados en las columnas del almacén
+    
+    @property
+    def health(self):
+        return int(self.store.health[self.index])
+    
+    @health.setter
+    def health(self, value):
+        self.store.health[self.index] = value
+    
+    @property
+    def speed(self):
+        return float(self.store.speed[self.index])
+    
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.index] = value
+    
+    @property
+    def state(self):
+        return "chase" if self.store.chasing[self.index] else "patrol"
+    
+    @state.setter
+    def state(self, value):
+        self.store.chasing[self.index] = value == "chase"
+    
+    @property
+    def patrol_point(self):
+        store, index = self.store, self.index
+        if not store.has_patrol[index]:
+            return None
+        return (float(store.patrol_x[index]), float(store.patrol_y[index]))
+    
+    @patrol_point.setter
+    def patrol_point(self, point):
+        store, index = self.store, self.index
+        store.has_patrol[index] = point is not None
+        if point is not None:
+            store.patrol_x[index], store.patrol_y[index] = point
+    
+    @property
+    def path(self):
+        """Tiles que faltan del camino: el siguiente (en el almacén) y el resto"""
+        store, index = self.store, self.index
+        if not store.has_target[index]:
+            return []
+        return [(int(store.target_x[index]), int(store.target_y[index]))] + self.path_rest
+    
+    @path.setter
+    def path(self, tiles):
+        store, index = self.store, self.index
+        store.has_target[index] = bool(tiles)
+        if tiles:
+            store.target_x[index], store.target_y[index] = tiles[0]
+        self.path_rest = list(tiles[1:]) if tiles else []
+    
+    @property
+    def last_path_update(self):
+        return int(self.store.last_path_update[self.index])
+    
+    @last_path_update.setter
+    def last_path_update(self, value):
+        self.store.last_path_update[self.index] = value
+    
+    def move_to(self, x, y):
+        """Mueve el enemigo (redondeando como pygame.Rect) y guarda la posición en el almacén"""
+        rect = self.rect
+        old_x, old_y = rect.x, rect.y
+        rect.x = x
+        rect.y = y
+        store, index = self.store, self.index
+        store.x[index] = rect.x
+        store.y[index] = rect.y
+        store.vx[index] = rect.x - old_x
+        store.vy[index] = rect.y - old_y
+    
     def create_behavior_tree(self):
         # Crear nodos de acción
         detect_player = DetectPlayer()
@@ -40,16 +146,21 @@ class Enemy:
     
     def update(self, player):
         # Ejecutar árbol de comportamiento
-        self.behavior_tree.run(self, player)
+        with tracer.span("behavior_tree", "ai"):
+            self.behavior_tree.run(self, player)
     
     def can_see_player(self, player):
-        # Calcular distancia al jugador
+        # Calcular distancia al jugador (al cuadrado, sin raíz)
         dx = player.rect.centerx - self.rect.centerx
         dy = player.rect.centery - self.rect.centery
-        distance = math.sqrt(dx * dx + dy * dy)
         
         # Comprobar si el jugador está dentro del radio de detección
-        if distance <= ENEMY_DETECTION_RADIUS:
+        if dx * dx + dy * dy <= ENEMY_DETECTION_RADIUS * ENEMY_DETECTION_RADIUS:
+            if self.visibility is not None:
+                # Consulta a la tabla de líneas de visión hacia el tile del jugador
+                return self.visibility.is_visible((self.rect.centerx // TILE_SIZE,
+                                                   self.rect.centery // TILE_SIZE))
+            
             # Comprobar si hay línea de visión (sin paredes en medio)
             return self.has_line_of_sight(player)
         
@@ -74,9 +185,14 @@ class Enemy:
         
         x, y = start_tile_x, start_tile_y
         
+        # Acceso directo al buffer del mapa
+        cells = self.level_map.cells
+        width = self.level_map.width
+        height = self.level_map.height
+        
         while x != end_tile_x or y != end_tile_y:
-            if 0 <= y < len(self.level_map) and 0 <= x < len(self.level_map[0]):
-                if self.level_map[y][x] == 1:  # Hay una pared
+            if 0 <= y < height and 0 <= x < width:
+                if cells[y * width + x] == 1:  # Hay una pared
                     return False
             
             e2 = 2 * err
@@ -90,8 +206,20 @@ class Enemy:
         return True
     
     def chase_player(self, player):
+        if self.flow_field is not None:
+            # Con campo de flujo, el siguiente paso se lee en O(1) al llegar a cada tile
+            if not self.path:
+                start_tile = (self.rect.centerx // TILE_SIZE, self.rect.centery // TILE_SIZE)
+                next_tile = self.flow_field.get_next_tile(start_tile)
+                self.path = [next_tile] if next_tile and next_tile != start_tile else []
+        else:
+            self.update_path(player)
+
+        self.follow_path()
+
+    def update_path(self, player):
         # Actualizar camino cada cierto tiempo para no sobrecargar
-        current_time = pygame.time.get_ticks()
+        current_time = clock.get_ticks()
         if current_time - self.last_path_update > 500:  # Actualizar cada 500ms
             self.last_path_update = current_time
             
@@ -99,14 +227,22 @@ class Enemy:
             start_tile = (self.rect.centerx // TILE_SIZE, self.rect.centery // TILE_SIZE)
             end_tile = (player.rect.centerx // TILE_SIZE, player.rect.centery // TILE_SIZE)
             
-            # Encontrar camino con A*
-            self.path = astar(start_tile, end_tile, self.level_map)
-        
-        # Seguir el camino si existe
-        if self.path and len(self.path) > 0:
-            next_tile = self.path[0]
+            # Encontrar camino con A* o HPA* (a través de la caché si existe; HPA* no da caminos óptimos)
+            search = self.planner.find_path if self.planner is not None else find_path
+            if self.path_cache is not None:
+                self.path = self.path_cache.get_path(start_tile, end_tile, self.level_map, search,
+                                                     optimal=self.planner is None)
+            else:
+                self.path = search(start_tile, end_tile, self.level_map)
+    
+    def follow_path(self):
+        # Seguir el camino si existe (leído una sola vez del almacén)
+        path = self.path
+        if path:
+            next_tile = path[0]
             target_x = next_tile[0] * TILE_SIZE + TILE_SIZE // 2
             target_y = next_tile[1] * TILE_SIZE + TILE_SIZE // 2
+            speed = self.speed
             
             # Mover hacia el siguiente punto del camino
             dx = target_x - self.rect.centerx
@@ -114,34 +250,36 @@ class Enemy:
             
             # Normalizar vector de dirección
             length = max(1, math.sqrt(dx * dx + dy * dy))
-            dx = dx / length * self.speed
-            dy = dy / length * self.speed
+            dx = dx / length * speed
+            dy = dy / length * speed
             
             # Actualizar posición
-            self.rect.x += dx
-            self.rect.y += dy
+            self.move_to(self.rect.x + dx, self.rect.y + dy)
             
             # Si llegamos al tile, avanzar al siguiente punto del camino
-            if abs(self.rect.centerx - target_x) < self.speed and abs(self.rect.centery - target_y) < self.speed:
-                self.path.pop(0)
+            if abs(self.rect.centerx - target_x) < speed and abs(self.rect.centery - target_y) < speed:
+                self.path = path[1:]
     
     def patrol(self):
         # Si no hay punto de patrulla o se ha alcanzado, elegir uno nuevo
-        if self.patrol_point is None or (
-            abs(self.rect.centerx - self.patrol_point[0]) < self.speed and 
-            abs(self.rect.centery - self.patrol_point[1]) < self.speed
+        patrol_point = self.patrol_point
+        speed = self.speed
+        if patrol_point is None or (
+            abs(self.rect.centerx - patrol_point[0]) < speed and 
+            abs(self.rect.centery - patrol_point[1]) < speed
         ):
             self.choose_patrol_point()
+            patrol_point = self.patrol_point
         
         # Mover hacia el punto de patrulla
-        if self.patrol_point:
-            dx = self.patrol_point[0] - self.rect.centerx
-            dy = self.patrol_point[1] - self.rect.centery
+        if patrol_point:
+            dx = patrol_point[0] - self.rect.centerx
+            dy = patrol_point[1] - self.rect.centery
             
             # Normalizar vector de dirección
             length = max(1, math.sqrt(dx * dx + dy * dy))
-            dx = dx / length * self.speed
-            dy = dy / length * self.speed
+            dx = dx / length * speed
+            dy = dy / length * speed
             
             # Actualizar posición
             new_rect = self.rect.copy()
@@ -152,15 +290,14 @@ class Enemy:
             tile_x = new_rect.centerx // TILE_SIZE
             tile_y = new_rect.centery // TILE_SIZE
             
-            if 0 <= tile_y < len(self.level_map) and 0 <= tile_x < len(self.level_map[0]):
-                if self.level_map[tile_y][tile_x] != 1:  # Si no es una pared
-                    self.rect = new_rect
+            if not self.level_map.is_wall(tile_x, tile_y):  # Dentro del mapa y no es una pared
+                self.move_to(new_rect.x, new_rect.y)
     
     def choose_patrol_point(self):
         # Elegir un punto aleatorio dentro del radio de patrulla
         for _ in range(10):  # Intentar 10 veces encontrar un punto válido
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(0, ENEMY_PATROL_RADIUS)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(0, ENEMY_PATROL_RADIUS)
             
             target_x = self.rect.centerx + math.cos(angle) * distance
             target_y = self.rect.centery + math.sin(angle) * distance
@@ -170,9 +307,7 @@ class Enemy:
             tile_y = int(target_y // TILE_SIZE)
             
             # Comprobar si el punto es válido (dentro del mapa y no es una pared)
-            if (0 <= tile_y < len(self.level_map) and 
-                0 <= tile_x < len(self.level_map[0]) and 
-                self.level_map[tile_y][tile_x] != 1):
+            if not self.level_map.is_wall(tile_x, tile_y):
                 
                 self.patrol_point = (target_x, target_y)
                 return
@@ -184,26 +319,49 @@ class Enemy:
     def take_damage(self, amount):
         self.health -= amount
     
-    def draw(self, screen):
+    def draw(self, screen, camera=None, queue=None):
+        # Sin cola de dibujado se dibuja inmediatamente con una cola propia
+        own_queue = queue is None
+        if own_queue:
+            queue = RenderQueue()
+        
+        # Posición en pantalla (con cámara, las coordenadas del enemigo son del mundo)
+        rect = camera.apply(self.rect) if camera else self.rect
+        
         if self.image:
             # Si hay imagen disponible, usarla
-            screen.blit(self.image, self.rect.topleft)
+            queue.add(self.image, rect.topleft, layer=LAYER_ENEMIES)
         else:
             # Fallback: dibujar rectángulo si no hay imagen
-            pygame.draw.rect(screen, self.color, self.rect)
+            queue.add_fill(rect.copy(), self.color, LAYER_ENEMIES)
         
         # Dibujar barra de salud
-        health_percentage = max(0, self.health / 50)
-        bar_width = ENEMY_SIZE
-        pygame.draw.rect(screen, RED, (self.rect.x, self.rect.y - 10, bar_width, 5))
-        pygame.draw.rect(screen, GREEN, (self.rect.x, self.rect.y - 10, bar_width * health_percentage, 5))
+        self.queue_health_bar(queue, rect, ENEMY_SIZE, self.health / 50)
+        
+        if own_queue:
+            queue.flush(screen)
+        
+        # Zona ensuciada: sprite más barra de salud
+        return pygame.Rect(rect.x, rect.y - 10, rect.width, rect.height + 10)
+    
+    def queue_health_bar(self, queue, rect, bar_width, health_percentage):
+        # Barra de salud con segmentos pre-renderizados: fondo completo y relleno recortado
+        empty, full = health_bar(bar_width)
+        position = (rect.x, rect.y - 10)
+        queue.add(empty, position, layer=LAYER_ENEMIES)
+        fill_width = int(bar_width * max(0, health_percentage))
+        if fill_width > 0:
+            queue.add(full, position, pygame.Rect(0, 0, fill_width, 5), LAYER_ENEMIES)
 
 
 class Boss(Enemy):
-    def __init__(self, x, y, level_map, walkable_tiles, image=None):
-        super().__init__(x, y, level_map, walkable_tiles, image)
+    def __init__(self, x, y, level_map, walkable_tiles, image=None, flow_field=None, path_cache=None,
+                 planner=None, visibility=None, rng=None, store=None):
+        super().__init__(x, y, level_map, walkable_tiles, image, flow_field, path_cache, planner, visibility, rng,
+                         store)
         self.health = 150
         self.speed = ENEMY_SPEED * 0.8  # Más lento pero más fuerte
+        self.store.boss[self.index] = True
         
         # Usar un color diferente para el jefe
         self.color = (150, 0, 150)  # Púrpura para el jefe
@@ -211,9 +369,21 @@ class Boss(Enemy):
         # Ajustar rectángulo para que sea más grande
         self.rect.width = ENEMY_SIZE * 1.5
         self.rect.height = ENEMY_SIZE * 1.5
+        self.store.width[self.index] = self.rect.width
+        self.store.height[self.index] = self.rect.height
         
-        # Ataques especiales
-        self.special_attack_cooldown = 0
+        # La imagen debería llegar ya escalada (SpriteVariants); si no, se escala una sola vez aquí
+        if self.image and self.image.get_size() != self.rect.size:
+            self.image = pygame.transform.scale(self.image, self.rect.size)
+    
+    @property
+    def special_attack_cooldown(self):
+        """Frames que faltan para poder volver a usar el ataque especial"""
+        return int(self.store.cooldown[self.index])
+    
+    @special_attack_cooldown.setter
+    def special_attack_cooldown(self, value):
+        self.store.cooldown[self.index] = value
     
     def update(self, player):
         super().update(player)
@@ -236,17 +406,27 @@ class Boss(Enemy):
                 # El ataque especial se implementaría aquí
                 # Por ejemplo, podría ser un ataque en área o un dash hacia el jugador
     
-    def draw(self, screen):
+    def draw(self, screen, camera=None, queue=None):
+        # Sin cola de dibujado se dibuja inmediatamente con una cola propia
+        own_queue = queue is None
+        if own_queue:
+            queue = RenderQueue()
+        
+        # Posición en pantalla (con cámara, las coordenadas del jefe son del mundo)
+        rect = camera.apply(self.rect) if camera else self.rect
+        
         if self.image:
-            # Si hay imagen disponible, usarla (escalada al tamaño del jefe)
-            scaled_image = pygame.transform.scale(self.image, (self.rect.width, self.rect.height))
-            screen.blit(scaled_image, self.rect.topleft)
+            # Si hay imagen disponible, usarla (ya escalada al tamaño del jefe)
+            queue.add(self.image, rect.topleft, layer=LAYER_ENEMIES)
         else:
             # Fallback: dibujar rectángulo si no hay imagen
-            pygame.draw.rect(screen, self.color, self.rect)
+            queue.add_fill(rect.copy(), self.color, LAYER_ENEMIES)
         
         # Dibujar barra de salud
-        health_percentage = max(0, self.health / 150)
-        bar_width = self.rect.width
-        pygame.draw.rect(screen, RED, (self.rect.x, self.rect.y - 10, bar_width, 5))
-        pygame.draw.rect(screen, GREEN, (self.rect.x, self.rect.y - 10, bar_width * health_percentage, 5))
\ No newline at end of file
+        self.queue_health_bar(queue, rect, rect.width, self.health / 150)
+        
+        if own_queue:
+            queue.flush(screen)
+        
+        # Zona ensuciada: sprite más barra de salud
+        return pygame.Rect(rect.x, rect.y - 10, rect.width, rect.height + 10)
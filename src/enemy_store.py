@@ -0,0 +1,244 @@
+import math
+try:
+    import numpy
+except ImportError:
+    # NumPy es opcional: sin él las columnas son listas y cada enemigo se actualiza por separado
+    numpy = None
+from src.utils.tracer import tracer
+from src.utils.constants import *
+
+# Columnas del almacén: (nombre, tipo NumPy, valor inicial)
+COLUMNS = (
+    ('x', 'int64', 0),                  # Esquina superior izquierda en píxeles
+    ('y', 'int64', 0),
+    ('width', 'int64', ENEMY_SIZE),
+    ('height', 'int64', ENEMY_SIZE),
+    ('vx', 'float64', 0.0),             # Desplazamiento del último paso
+    ('vy', 'float64', 0.0),
+    ('speed', 'float64', ENEMY_SPEED),
+    ('health', 'int64', 50),
+    ('chasing', 'bool', False),         # Estado: persiguiendo ("chase") o patrullando ("patrol")
+    ('has_patrol', 'bool', False),      # Punto de patrulla (en píxeles, con decimales)
+    ('patrol_x', 'float64', 0.0),
+    ('patrol_y', 'float64', 0.0),
+    ('has_target', 'bool', False),      # Siguiente tile del camino
+    ('target_x', 'int64', 0),
+    ('target_y', 'int64', 0),
+    ('boss', 'bool', False),
+    ('cooldown', 'int64', 0),           # Frames hasta el próximo ataque especial del jefe
+    ('last_path_update', 'int64', 0),   # Milisegundos de la última búsqueda A*
+)
+
+def round_half_away(values):
+    """Redondea como pygame.Rect al asignarle decimales: los .5 se alejan del cero"""
+    magnitude = numpy.abs(values)
+    whole = numpy.floor(magnitude)
+    whole += magnitude - whole >= 0.5
+    return numpy.copysign(whole, values).astype(numpy.int64)
+
+
+class EnemyStore:
+    """
+    Almacén de los enemigos de un piso como estructura de arrays
+
+    Posición, desplazamiento, velocidad, salud, estado, punto de patrulla,
+    siguiente tile y temporizadores de todos los enemigos viven en una
+    columna por atributo; Enemy y Boss son vistas sobre una fila (su index)
+    que leen y escriben esas columnas. Su rect es un reflejo de x/y que el
+    almacén mantiene al día para colisiones, rejilla espacial y dibujado.
+
+    Con NumPy, update() avanza a todos los enemigos a la vez: distancias al
+    jugador, percepción, movimiento de patrulla y de persecución se calculan
+    sobre los arrays y solo se recorren uno a uno los enemigos que necesitan
+    un punto de patrulla o un tile nuevos. El resultado es idéntico al de
+    ejecutar el árbol de comportamiento de cada enemigo (que es lo que se hace
+    sin NumPy o sin campo de flujo).
+    """
+    def __init__(self, level_map, flow_field=None, visibility=None, capacity=16):
+        self.level_map = level_map
+        self.flow_field = flow_field
+        self.visibility = visibility
+        self.count = 0
+        self.capacity = capacity if numpy is not None else 0
+        # Vista (Enemy) de cada fila
+        self.views = []
+        for name, dtype, default in COLUMNS:
+            if numpy is not None:
+                column = numpy.full(self.capacity, default, dtype=dtype)
+            else:
+                column = []
+            setattr(self, name, column)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, view, x, y):
+        """Añade una fila con los valores por defecto en (x, y) y devuelve su índice"""
+        index = self.count
+        if numpy is not None:
+            if index == self.capacity:
+                self._grow()
+            for name, dtype, default in COLUMNS:
+                getattr(self, name)[index] = default
+        else:
+            for name, dtype, default in COLUMNS:
+                getattr(self, name).append(default)
+        self.x[index] = x
+        self.y[index] = y
+        self.views.append(view)
+        self.count += 1
+        return index
+
+    def _grow(self):
+        self.capacity = max(16, self.capacity * 2)
+        for name, dtype, default in COLUMNS:
+            column = numpy.full(self.capacity, default, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def remove_dead(self):
+        """
+        Quita las filas de los enemigos sin salud, conservando el orden del resto
+
+        Returns:
+            Lista de vistas de los enemigos que siguen vivos
+        """
+        alive = [index for index in range(self.count) if self.health[index] > 0]
+        if len(alive) == self.count:
+            return self.views
+        for name, dtype, default in COLUMNS:
+            column = getattr(self, name)
+            if numpy is not None:
+                column[:len(alive)] = column[alive]
+            else:
+                setattr(self, name, [column[index] for index in alive])
+        self.views = [self.views[index] for index in alive]
+        self.count = len(alive)
+        for index, view in enumerate(self.views):
+            view.index = index
+        return self.views
+
+    @tracer.traced("EnemyStore.update", "ai")
+    def update(self, player):
+        """
+        Avanza un frame a todos los enemigos
+
+        Returns:
+            Lista de vistas de los enemigos que se han movido
+        """
+        if numpy is None or self.flow_field is None or self.count < VECTORIZE_MIN_ENEMIES:
+            # Sin NumPy, con caminos A* de longitud variable o con pocos enemigos (los arrays no
+            # compensan su coste fijo) cada enemigo ejecuta su árbol
+            moved = []
+            for view in self.views:
+                position = view.rect.topleft
+                view.update(player)
+                if view.rect.topleft != position:
+                    moved.append(view)
+            return moved
+        return self._update_vectorized(player)
+
+    def _update_vectorized(self, player):
+        count = self.count
+        x = self.x[:count]
+        y = self.y[:count]
+        speed = self.speed[:count]
+        half_width = self.width[:count] // 2
+        half_height = self.height[:count] // 2
+        center_x = x + half_width
+        center_y = y + half_height
+
+        # Percepción: dentro del radio de detección y con línea de visión desde su tile
+        # (los centros de los enemigos nunca salen del mapa)
+        dx = player.rect.centerx - center_x
+        dy = player.rect.centery - center_y
+        sees = dx * dx + dy * dy <= ENEMY_DETECTION_RADIUS * ENEMY_DETECTION_RADIUS
+        if self.visibility is not None:
+            cell, _ = self._floor_cells(center_x, center_y)
+            sees &= numpy.frombuffer(self.visibility.visible, dtype=numpy.uint8)[cell] != 0
+        else:
+            for index in numpy.flatnonzero(sees).tolist():
+                sees[index] = self.views[index].has_line_of_sight(player)
+        self.chasing[:count] = sees
+
+        # Persecución: pedir al campo de flujo el siguiente tile a los que no tienen
+        has_target = self.has_target[:count]
+        target_x = self.target_x[:count]
+        target_y = self.target_y[:count]
+        for index in numpy.flatnonzero(sees & ~has_target).tolist():
+            start_tile = (int(center_x[index]) // TILE_SIZE, int(center_y[index]) // TILE_SIZE)
+            next_tile = self.flow_field.get_next_tile(start_tile)
+            if next_tile and next_tile != start_tile:
+                has_target[index] = True
+                target_x[index], target_y[index] = next_tile
+        chase = sees & has_target
+        goal_x = target_x * TILE_SIZE + TILE_SIZE // 2
+        goal_y = target_y * TILE_SIZE + TILE_SIZE // 2
+
+        # Patrulla: los que han llegado a su punto (o no tienen) eligen otro, en orden
+        patrol = ~sees
+        patrol_x = self.patrol_x[:count]
+        patrol_y = self.patrol_y[:count]
+        reached = (numpy.abs(center_x - patrol_x) < speed) & (numpy.abs(center_y - patrol_y) < speed)
+        for index in numpy.flatnonzero(patrol & (~self.has_patrol[:count] | reached)).tolist():
+            self.views[index].choose_patrol_point()
+
+        # Un paso de longitud speed hacia el tile del camino o hacia el punto de patrulla
+        step_x = numpy.where(chase, goal_x, patrol_x) - center_x
+        step_y = numpy.where(chase, goal_y, patrol_y) - center_y
+        length = numpy.maximum(1, numpy.sqrt(step_x * step_x + step_y * step_y))
+        new_x = round_half_away(x + step_x / length * speed)
+        new_y = round_half_away(y + step_y / length * speed)
+
+        # Patrullando solo se avanza si el centro nuevo cae en un tile de suelo dentro del mapa
+        _, free = self._floor_cells(new_x + half_width, new_y + half_height)
+        move = chase | (patrol & free)
+        moved_rows = numpy.flatnonzero(move & ((new_x != x) | (new_y != y)))
+        self.vx[:count] = 0
+        self.vy[:count] = 0
+        self.vx[moved_rows] = new_x[moved_rows] - x[moved_rows]
+        self.vy[moved_rows] = new_y[moved_rows] - y[moved_rows]
+        x[moved_rows] = new_x[moved_rows]
+        y[moved_rows] = new_y[moved_rows]
+
+        # Al llegar al tile del camino se pasa al siguiente
+        arrived = chase & (numpy.abs(new_x + half_width - goal_x) < speed) & \
+                  (numpy.abs(new_y + half_height - goal_y) < speed)
+        has_target[arrived] = False
+
+        # Ataque especial del jefe al perseguir de cerca; después corre el cooldown
+        boss = self.boss[:count]
+        if boss.any():
+            cooldown = self.cooldown[:count]
+            for index in numpy.flatnonzero(boss & sees & (cooldown <= 0)).tolist():
+                distance_x = player.rect.centerx - int(x[index] + half_width[index])
+                distance_y = player.rect.centery - int(y[index] + half_height[index])
+                if math.sqrt(distance_x * distance_x + distance_y * distance_y) < ENEMY_SIZE * 3:
+                    cooldown[index] = 120
+            cooldown[boss & (cooldown > 0)] -= 1
+
+        # Reflejar la posición nueva en los rect de los que se han movido
+        moved = []
+        views = self.views
+        for index, position_x, position_y in zip(moved_rows.tolist(), x[moved_rows].tolist(),
+                                                  y[moved_rows].tolist()):
+            view = views[index]
+            view.rect.x = position_x
+            view.rect.y = position_y
+            moved.append(view)
+        return moved
+
+    def _floor_cells(self, center_x, center_y):
+        """
+        Celdas del mapa bajo los puntos (center_x, center_y), en píxeles
+
+        Returns:
+            Tupla (índices de celda, máscara de puntos dentro del mapa y sobre suelo)
+        """
+        level = self.level_map
+        tile_x = center_x // TILE_SIZE
+        tile_y = center_y // TILE_SIZE
+        inside = (tile_x >= 0) & (tile_x < level.width) & (tile_y >= 0) & (tile_y < level.height)
+        cell = numpy.where(inside, tile_y * level.width + tile_x, 0)
+        floor = inside & (numpy.frombuffer(level.cells, dtype=numpy.uint8)[cell] == 0)
+        return cell, floor
@@ -0,0 +1,153 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from src.level_generator import LevelGenerator
+from src.enemy import Enemy, Boss
+from src.enemy_store import EnemyStore
+from src.ai.hpa import HierarchicalPlanner
+from src.ai.flow_field import FlowField
+from src.ai.visibility import VisibilityMap
+from src.utils.tracer import tracer
+from src.utils.constants import *
+
+class FloorPlan:
+    """
+    Un piso listo para jugar: mapa, estructuras de IA, posiciones y entidades
+
+    Se construye sin tocar el estado de la partida, así que puede prepararse
+    en otro hilo mientras se juega el piso anterior; Game.enter_floor() solo
+    tiene que colocarlo.
+    """
+    def __init__(self, number, rng):
+        self.number = number
+        # Generador del piso; al entrar en él lo heredan sus enemigos para patrullar
+        self.rng = rng
+        self.level_map = None
+        self.walkable_tiles = []
+        self.planner = None
+        self.flow_field = None
+        self.visibility = None
+        self.enemy_store = None
+        self.player_pos = None
+        self.stairs_pos = None
+        self.enemies = []
+        self.items = []
+
+    def random_position(self, exclude=()):
+        """Posición en píxeles de un tile caminable al azar que no esté en exclude"""
+        while True:
+            pos = self.rng.choice(self.walkable_tiles)
+            pixel_pos = (pos[0] * TILE_SIZE, pos[1] * TILE_SIZE)
+
+            if pixel_pos not in exclude:
+                return pixel_pos
+
+
+@tracer.traced("build_floor")
+def build_floor(number, seed, sprites=None, path_cache=None, enemy_count=None):
+    """
+    Genera un piso completo a partir de su semilla
+
+    Args:
+        number: Número del piso (0-indexed)
+        seed: Semilla del piso; la misma semilla produce siempre el mismo piso
+        sprites: SpriteVariants con las imágenes de los enemigos (opcional)
+        path_cache: Caché de caminos de la partida que compartirán los enemigos
+        enemy_count: Número de enemigos (por defecto 2 + piso)
+
+    Returns:
+        FloorPlan del piso
+    """
+    plan = FloorPlan(number, random.Random(seed))
+
+    # Mapa y estructuras de IA del piso
+    generator = LevelGenerator(plan.rng)
+    plan.level_map, plan.walkable_tiles = generator.generate_floor(number)
+    plan.planner = HierarchicalPlanner(plan.level_map, generator.rooms)
+    plan.flow_field = FlowField(plan.level_map)
+    plan.visibility = VisibilityMap(plan.level_map)
+    plan.enemy_store = EnemyStore(plan.level_map, plan.flow_field, plan.visibility)
+
+    # Jugador, enemigos, escaleras y objetos sin solaparse
+    plan.player_pos = plan.random_position()
+    occupied = [plan.player_pos]
+
+    if enemy_count is None:
+        enemy_count = 2 + number
+    for index in range(enemy_count):
+        x, y = plan.random_position(occupied)
+        occupied.append((x, y))
+
+        # En el último piso el primer enemigo es el jefe
+        if number == FLOOR_COUNT - 1 and index == 0:
+            enemy_class, image = Boss, sprites.get('boss') if sprites else None
+        else:
+            enemy_class, image = Enemy, sprites.get('enemy') if sprites else None
+        plan.enemies.append(enemy_class(x, y, plan.level_map, plan.walkable_tiles, image,
+                                        flow_field=plan.flow_field, path_cache=path_cache,
+                                        planner=plan.planner, visibility=plan.visibility, rng=plan.rng,
+                                        store=plan.enemy_store))
+
+    plan.stairs_pos = plan.random_position(occupied)
+    occupied.append(plan.stairs_pos)
+
+    for _ in range(2 + number // 2):
+        item_pos = plan.random_position(occupied)
+        occupied.append(item_pos)
+
+        # Determinar tipo de objeto (poción o poder)
+        item_type = "potion" if plan.rng.random() < 0.5 else "power"
+        plan.items.append({
+            'type': item_type,
+            'pos': item_pos,
+            'rect': pygame.Rect(item_pos[0], item_pos[1], TILE_SIZE, TILE_SIZE)
+        })
+    return plan
+
+
+class FloorPrefetcher:
+    """
+    Prepara los pisos siguientes en un hilo de fondo
+
+    Se piden con prefetch() y se recogen con take(); como cada piso sale de
+    su propia semilla, el resultado es el mismo se haya generado por
+    adelantado o no. Nunca hay más de depth pisos pedidos a la vez.
+    """
+    def __init__(self, build, depth=PREFETCH_DEPTH):
+        """
+        Args:
+            build: Función build(número) que devuelve el FloorPlan de ese piso
+            depth: Pisos como máximo preparados por adelantado (0 = generarlos al pedirlos)
+        """
+        self.build = build
+        self.depth = depth
+        self.pending = {}
+        self.executor = None
+
+    def prefetch(self, first):
+        """Pide en segundo plano los pisos desde first, hasta depth pendientes"""
+        number = first
+        while len(self.pending) < self.depth and number < FLOOR_COUNT:
+            if number not in self.pending:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-prefetch")
+                self.pending[number] = self.executor.submit(self.build, number)
+            number += 1
+
+    def take(self, number):
+        """
+        Devuelve el FloorPlan del piso number
+
+        Si ya está preparado se entrega al instante; si se está generando se
+        espera a que termine y si no se pidió se genera aquí mismo.
+        """
+        future = self.pending.pop(number, None)
+        if future is None:
+            return self.build(number)
+        return future.result()
+
+    def clear(self):
+        """Olvida los pisos pedidos (p. ej. al reiniciar la partida con otra semilla)"""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
@@ -1,11 +1,25 @@
+import random
 import pygame
 from src.player import Player
-from src.level_generator import LevelGenerator
-from src.enemy import Enemy, Boss
+from src.floor_plan import FloorPrefetcher, build_floor
+from src.ai.path_cache import PathCache
+from src.utils.spatial_hash import SpatialHash
+from src.utils.sprites import SpriteVariants
+from src.utils.atlas import TextureAtlas
+from src.utils.render_queue import RenderQueue, LAYER_ITEMS
+from src.utils.asset_bundle import load_asset_bundle, save_asset_bundle, source_key
+from src.camera import Camera
+from src.ui.text_cache import TextCache
+from src.utils.profiler import profiler
+from src.utils.tracer import tracer
+from src.ai import astar as pathfinding
 from src.utils.constants import *
 
+@tracer.traced("safe_play_music", "audio")
 def safe_play_music(music_file, loop=0):
     """Safely load and play a music file, handling errors if the file doesn't exist."""
+    if not pygame.mixer.get_init():
+        return False
     try:
         pygame.mixer.music.load(music_file)
         pygame.mixer.music.play(loop)
@@ -14,223 +28,290 @@ def safe_play_music(music_file, loop=0):
         print(f"Warning: Could not load music file {music_file}")
         return False
 
+def render_images():
+    """
+    Renderiza las imágenes del juego a partir de los SVG (con cairosvg) o con arte procedimental
+    
+    Returns:
+        Diccionario nombre -> pygame.Surface
+    """
+    try:
+        # Intentar cargar imágenes SVG con cairosvg
+        try:
+            import cairosvg
+            import io
+            
+            def load_svg(path, size):
+                try:
+                    png_data = cairosvg.svg2png(url=path, output_width=size, output_height=size)
+                    return pygame.image.load(io.BytesIO(png_data))
+                except Exception as e:
+                    print(f"Error converting SVG {path}: {e}")
+                    return None
+            
+            print("Attempting to load SVG images using cairosvg...")
+            images = {
+                'player': load_svg('assets/images/player.svg', TILE_SIZE),
+                'enemy': load_svg('assets/images/enemy.svg', TILE_SIZE),
+                'boss': load_svg('assets/images/boss.svg', TILE_SIZE),
+                'potion': load_svg('assets/images/potion.svg', TILE_SIZE),
+                'power': load_svg('assets/images/power.svg', TILE_SIZE),
+                'stairs': load_svg('assets/images/stairs.svg', TILE_SIZE),
+                'wall': load_svg('assets/images/wall.svg', TILE_SIZE),
+                'floor': load_svg('assets/images/floor.svg', TILE_SIZE)
+            }
+            
+            # Filtrar imágenes que no se pudieron cargar
+            failed_images = [k for k, v in images.items() if v is None]
+            images = {k: v for k, v in images.items() if v is not None}
+            
+            if failed_images:
+                print(f"Warning: Could not load these SVG images: {', '.join(failed_images)}")
+            
+            if not images:
+                raise Exception("No se pudo cargar ninguna imagen SVG")
+                
+        except ImportError:
+            print("Warning: cairosvg not available. You can install it with: pip install cairosvg")
+            raise Exception("cairosvg not available")
+            
+    except Exception as e:
+        print(f"Warning: Could not load SVG images: {e}")
+        print("Using colored rectangles with SVG patterns instead")
+        
+        # Crear representaciones mejoradas de cada elemento
+        images = {}
+        
+        # Jugador (verde con forma de persona)
+        player_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        # Cuerpo
+        pygame.draw.circle(player_surf, (0, 180, 0), (TILE_SIZE//2, TILE_SIZE//3), TILE_SIZE//4)  # Cabeza
+        pygame.draw.rect(player_surf, (0, 200, 0), (TILE_SIZE//3, TILE_SIZE//3, TILE_SIZE//3, TILE_SIZE//2))  # Cuerpo
+        # Brazos
+        pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE//3, TILE_SIZE//2), (TILE_SIZE//6, TILE_SIZE//2), 3)  # Brazo izq
+        pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE*2//3, TILE_SIZE//2), (TILE_SIZE*5//6, TILE_SIZE//2), 3)  # Brazo der
+        # Piernas
+        pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE*2//5, TILE_SIZE*5//6), (TILE_SIZE*2//5, TILE_SIZE*5//6), 3)  # Pierna izq
+        pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE*3//5, TILE_SIZE*5//6), (TILE_SIZE*3//5, TILE_SIZE*5//6), 3)  # Pierna der
+        # Detalles
+        pygame.draw.circle(player_surf, WHITE, (TILE_SIZE*2//5, TILE_SIZE//3), TILE_SIZE//12)  # Ojo izq
+        pygame.draw.circle(player_surf, WHITE, (TILE_SIZE*3//5, TILE_SIZE//3), TILE_SIZE//12)  # Ojo der
+        images['player'] = player_surf
+        
+        # Enemigo (rojo con forma de fantasma)
+        enemy_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        # Cuerpo
+        points = [
+            (TILE_SIZE//6, TILE_SIZE//2),
+            (TILE_SIZE//6, TILE_SIZE//3),
+            (TILE_SIZE//3, TILE_SIZE//6),
+            (TILE_SIZE*2//3, TILE_SIZE//6),
+            (TILE_SIZE*5//6, TILE_SIZE//3),
+            (TILE_SIZE*5//6, TILE_SIZE//2),
+            (TILE_SIZE*5//6, TILE_SIZE*2//3),
+            (TILE_SIZE*3//4, TILE_SIZE*5//6),
+            (TILE_SIZE*2//3, TILE_SIZE*2//3),
+            (TILE_SIZE//2, TILE_SIZE*5//6),
+            (TILE_SIZE//3, TILE_SIZE*2//3),
+            (TILE_SIZE//4, TILE_SIZE*5//6),
+            (TILE_SIZE//6, TILE_SIZE*2//3)
+        ]
+        pygame.draw.polygon(enemy_surf, RED, points)
+        # Ojos
+        pygame.draw.circle(enemy_surf, WHITE, (TILE_SIZE//3, TILE_SIZE//3), TILE_SIZE//8)  # Ojo izq
+        pygame.draw.circle(enemy_surf, WHITE, (TILE_SIZE*2//3, TILE_SIZE//3), TILE_SIZE//8)  # Ojo der
+        pygame.draw.circle(enemy_surf, BLACK, (TILE_SIZE//3, TILE_SIZE//3), TILE_SIZE//16)  # Pupila izq
+        pygame.draw.circle(enemy_surf, BLACK, (TILE_SIZE*2//3, TILE_SIZE//3), TILE_SIZE//16)  # Pupila der
+        images['enemy'] = enemy_surf
+        
+        # Jefe (púrpura, más grande y amenazante)
+        boss_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        # Cuerpo
+        pygame.draw.circle(boss_surf, (150, 0, 150), (TILE_SIZE//2, TILE_SIZE//2), TILE_SIZE//2.2)
+        # Corona
+        points = [
+            (TILE_SIZE//4, TILE_SIZE//4),
+            (TILE_SIZE//3, TILE_SIZE//8),
+            (TILE_SIZE*2//5, TILE_SIZE//4),
+            (TILE_SIZE//2, TILE_SIZE//8),
+            (TILE_SIZE*3//5, TILE_SIZE//4),
+            (TILE_SIZE*2//3, TILE_SIZE//8),
+            (TILE_SIZE*3//4, TILE_SIZE//4)
+        ]
+        pygame.draw.polygon(boss_surf, (200, 180, 0), points)  # Corona dorada
+        # Ojos
+        pygame.draw.circle(boss_surf, RED, (TILE_SIZE//3, TILE_SIZE*2//5), TILE_SIZE//10)  # Ojo izq
+        pygame.draw.circle(boss_surf, RED, (TILE_SIZE*2//3, TILE_SIZE*2//5), TILE_SIZE//10)  # Ojo der
+        # Boca
+        pygame.draw.arc(boss_surf, WHITE, (TILE_SIZE//3, TILE_SIZE//2, TILE_SIZE//3, TILE_SIZE//4), 0, 3.14, 2)
+        images['boss'] = boss_surf
+        
+        # Poción (verde con forma de botella)
+        potion_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        # Botella
+        pygame.draw.rect(potion_surf, (0, 100, 0), (TILE_SIZE*3//8, TILE_SIZE//6, TILE_SIZE//4, TILE_SIZE//8))  # Tapón
+        pygame.draw.polygon(potion_surf, (0, 180, 0), [
+            (TILE_SIZE//3, TILE_SIZE//4), 
+            (TILE_SIZE*2//3, TILE_SIZE//4), 
+            (TILE_SIZE*2//3, TILE_SIZE*3//4), 
+            (TILE_SIZE//2, TILE_SIZE*7//8), 
+            (TILE_SIZE//3, TILE_SIZE*3//4)
+        ])  # Botella
+        # Líquido
+        pygame.draw.polygon(potion_surf, (100, 255, 100), [
+            (TILE_SIZE//3 + 2, TILE_SIZE//2), 
+            (TILE_SIZE*2//3 - 2, TILE_SIZE//2), 
+            (TILE_SIZE*2//3 - 2, TILE_SIZE*3//4 - 2), 
+            (TILE_SIZE//2, TILE_SIZE*7//8 - 2), 
+            (TILE_SIZE//3 + 2, TILE_SIZE*3//4 - 2)
+        ])  # Líquido
+        # Brillo
+        pygame.draw.circle(potion_surf, (200, 255, 200), (TILE_SIZE//2, TILE_SIZE*5//8), TILE_SIZE//12)
+        images['potion'] = potion_surf
+        
+        # Poder (azul con forma de rayo)
+        power_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        # Rayo
+        pygame.draw.polygon(power_surf, (50, 50, 255), [
+            (TILE_SIZE//2, TILE_SIZE//8), 
+            (TILE_SIZE*3//4, TILE_SIZE*2//5), 
+            (TILE_SIZE*3//5, TILE_SIZE*2//5), 
+            (TILE_SIZE*2//3, TILE_SIZE*7//8), 
+            (TILE_SIZE*2//5, TILE_SIZE*3//5),
+            (TILE_SIZE*2//5, TILE_SIZE*3//5),
+            (TILE_SIZE*3//5, TILE_SIZE*3//5),
+            (TILE_SIZE//4, TILE_SIZE//3)
+        ])
+        # Brillo
+        pygame.draw.polygon(power_surf, (150, 150, 255), [
+            (TILE_SIZE//2, TILE_SIZE//6), 
+            (TILE_SIZE*2//3, TILE_SIZE*2//5), 
+            (TILE_SIZE//2, TILE_SIZE//2), 
+            (TILE_SIZE*3//5, TILE_SIZE*3//4)
+        ])
+        images['power'] = power_surf
+        
+        # Escaleras (púrpura)
+        stairs_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        # Marco
+        pygame.draw.rect(stairs_surf, (100, 0, 100), (TILE_SIZE//8, TILE_SIZE//8, TILE_SIZE*3//4, TILE_SIZE*3//4), 3)
+        # Escalones
+        for i in range(1, 6):
+            y_pos = TILE_SIZE//8 + i * (TILE_SIZE*3//4) // 6
+            pygame.draw.line(stairs_surf, (150, 0, 150), 
+                           (TILE_SIZE//8, y_pos), 
+                           (TILE_SIZE*7//8, y_pos), 2)
+        # Barandilla
+        pygame.draw.line(stairs_surf, (150, 0, 150), 
+                       (TILE_SIZE//3, TILE_SIZE//8), 
+                       (TILE_SIZE//3, TILE_SIZE*7//8), 2)
+        images['stairs'] = stairs_surf
+        
+        # Pared (gris oscuro con textura de ladrillos)
+        wall_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        wall_surf.fill(DARK_GRAY)
+        # Ladrillos horizontales
+        for y in range(0, TILE_SIZE, TILE_SIZE//4):
+            pygame.draw.line(wall_surf, BLACK, (0, y), (TILE_SIZE, y), 1)
+        # Ladrillos verticales (alternados)
+        for i in range(4):
+            offset = 0 if i % 2 == 0 else TILE_SIZE//2
+            for x in range(offset, TILE_SIZE + offset, TILE_SIZE):
+                pygame.draw.line(wall_surf, BLACK, 
+                               (x, i * TILE_SIZE//4), 
+                               (x, (i+1) * TILE_SIZE//4), 1)
+        images['wall'] = wall_surf
+        
+        # Suelo (gris con textura de baldosas)
+        floor_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        floor_surf.fill(GRAY)
+        # Líneas de baldosas
+        pygame.draw.line(floor_surf, DARK_GRAY, (0, TILE_SIZE//2), (TILE_SIZE, TILE_SIZE//2), 1)
+        pygame.draw.line(floor_surf, DARK_GRAY, (TILE_SIZE//2, 0), (TILE_SIZE//2, TILE_SIZE), 1)
+        # Sombras
+        pygame.draw.line(floor_surf, (80, 80, 80), (0, 0), (TILE_SIZE//2, TILE_SIZE//2), 1)
+        pygame.draw.line(floor_surf, (80, 80, 80), (TILE_SIZE, 0), (TILE_SIZE//2, TILE_SIZE//2), 1)
+        pygame.draw.line(floor_surf, (80, 80, 80), (0, TILE_SIZE), (TILE_SIZE//2, TILE_SIZE//2), 1)
+        pygame.draw.line(floor_surf, (80, 80, 80), (TILE_SIZE, TILE_SIZE), (TILE_SIZE//2, TILE_SIZE//2), 1)
+        images['floor'] = floor_surf
+    
+    return images
+
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, text_cache=None, progress=None, rng=None):
+        """
+        Args:
+            screen: Superficie de la pantalla
+            text_cache: TextCache compartida con los menús (se crea una si no se indica)
+            progress: Función progress(fase, fracción) a la que se avisa al terminar
+                cada fase de la inicialización (la usa GameLoader)
+            rng: random.Random de la partida (con semilla para partidas reproducibles)
+        """
         self.screen = screen
-        self.level_generator = LevelGenerator()
+        self.rng = rng if rng is not None else random.Random()
+        
+        # Caché de caminos A* (se invalida en cada piso nuevo)
+        self.path_cache = PathCache()
         
-        # Cargar imágenes
+        # Generación de los pisos siguientes en segundo plano
+        self.prefetcher = FloorPrefetcher(self.build_floor)
+        
+        # Rejilla espacial con enemigos, objetos y escaleras para las colisiones
+        self.spatial = SpatialHash(TILE_SIZE)
+        
+        # Cámara que sigue al jugador en pisos más grandes que la pantalla
+        self.camera = Camera(screen.get_width(), screen.get_height())
+        
+        # Fuentes y textos renderizados compartidos por el HUD y los menús
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        
+        # Cola de dibujado de los sprites del mundo (se vacía en cada draw())
+        self.render_queue = RenderQueue()
+        
+        # Contadores de búsqueda de caminos para el perfilador (F3)
+        profiler.watch("A* caminos", pathfinding.stats, 'searches')
+        profiler.watch("A* nodos", pathfinding.stats, 'expanded')
+        
+        # Cargar imágenes y preparar sus variantes (escaladas, tintadas)
         self.load_images()
+        self.sprites = SpriteVariants(self.images)
+        if progress:
+            progress("images", 0.5)
+        
+        # Convertir todas las imágenes al formato de la pantalla y empaquetarlas en un atlas;
+        # las imágenes base pasan a ser vistas del atlas (la del jefe, ya escalada)
+        self.atlas = TextureAtlas()
+        if self.images:
+            self.sprites.variants = self.atlas.pack(self.sprites.variants)
+            self.images = {name: self.sprites.get(name) for name in self.images}
+        if progress:
+            progress("atlas", 0.6)
         
         self.reset()
+        if progress:
+            progress("first floor", 0.9)
         
         # Cargar sonidos
         self.load_sounds()
         
         # Cargar música
-        safe_play_music(GAME_MUSIC)
-        pygame.mixer.music.set_volume(0.5)
+        if safe_play_music(GAME_MUSIC):
+            pygame.mixer.music.set_volume(0.5)
+        if progress:
+            progress("audio", 1.0)
     
     def load_images(self):
+        # Usar el paquete pre-renderizado si está al día; si no, renderizar y volver a guardarlo
+        key = source_key(render_images)
+        self.images = load_asset_bundle(ASSET_BUNDLE, key)
+        if self.images is not None:
+            return
+        
+        self.images = render_images()
         try:
-            # Intentar cargar imágenes SVG con cairosvg
-            try:
-                import cairosvg
-                import io
-                
-                def load_svg(path, size):
-                    try:
-                        png_data = cairosvg.svg2png(url=path, output_width=size, output_height=size)
-                        return pygame.image.load(io.BytesIO(png_data))
-                    except Exception as e:
-                        print(f"Error converting SVG {path}: {e}")
-                        return None
-                
-                print("Attempting to load SVG images using cairosvg...")
-                self.images = {
-                    'player': load_svg('assets/images/player.svg', TILE_SIZE),
-                    'enemy': load_svg('assets/images/enemy.svg', TILE_SIZE),
-                    'boss': load_svg('assets/images/boss.svg', TILE_SIZE),
-                    'potion': load_svg('assets/images/potion.svg', TILE_SIZE),
-                    'power': load_svg('assets/images/power.svg', TILE_SIZE),
-                    'stairs': load_svg('assets/images/stairs.svg', TILE_SIZE),
-                    'wall': load_svg('assets/images/wall.svg', TILE_SIZE),
-                    'floor': load_svg('assets/images/floor.svg', TILE_SIZE)
-                }
-                
-                # Filtrar imágenes que no se pudieron cargar
-                failed_images = [k for k, v in self.images.items() if v is None]
-                self.images = {k: v for k, v in self.images.items() if v is not None}
-                
-                if failed_images:
-                    print(f"Warning: Could not load these SVG images: {', '.join(failed_images)}")
-                
-                if not self.images:
-                    raise Exception("No se pudo cargar ninguna imagen SVG")
-                    
-            except ImportError:
-                print("Warning: cairosvg not available. You can install it with: pip install cairosvg")
-                raise Exception("cairosvg not available")
-                
-        except Exception as e:
-            print(f"Warning: Could not load SVG images: {e}")
-            print("Using colored rectangles with SVG patterns instead")
-            
-            # Crear representaciones mejoradas de cada elemento
-            self.images = {}
-            
-            # Jugador (verde con forma de persona)
-            player_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-            # Cuerpo
-            pygame.draw.circle(player_surf, (0, 180, 0), (TILE_SIZE//2, TILE_SIZE//3), TILE_SIZE//4)  # Cabeza
-            pygame.draw.rect(player_surf, (0, 200, 0), (TILE_SIZE//3, TILE_SIZE//3, TILE_SIZE//3, TILE_SIZE//2))  # Cuerpo
-            # Brazos
-            pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE//3, TILE_SIZE//2), (TILE_SIZE//6, TILE_SIZE//2), 3)  # Brazo izq
-            pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE*2//3, TILE_SIZE//2), (TILE_SIZE*5//6, TILE_SIZE//2), 3)  # Brazo der
-            # Piernas
-            pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE*2//5, TILE_SIZE*5//6), (TILE_SIZE*2//5, TILE_SIZE*5//6), 3)  # Pierna izq
-            pygame.draw.line(player_surf, (0, 180, 0), (TILE_SIZE*3//5, TILE_SIZE*5//6), (TILE_SIZE*3//5, TILE_SIZE*5//6), 3)  # Pierna der
-            # Detalles
-            pygame.draw.circle(player_surf, WHITE, (TILE_SIZE*2//5, TILE_SIZE//3), TILE_SIZE//12)  # Ojo izq
-            pygame.draw.circle(player_surf, WHITE, (TILE_SIZE*3//5, TILE_SIZE//3), TILE_SIZE//12)  # Ojo der
-            self.images['player'] = player_surf
-            
-            # Enemigo (rojo con forma de fantasma)
-            enemy_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-            # Cuerpo
-            points = [
-                (TILE_SIZE//6, TILE_SIZE//2),
-                (TILE_SIZE//6, TILE_SIZE//3),
-                (TILE_SIZE//3, TILE_SIZE//6),
-                (TILE_SIZE*2//3, TILE_SIZE//6),
-                (TILE_SIZE*5//6, TILE_SIZE//3),
-                (TILE_SIZE*5//6, TILE_SIZE//2),
-                (TILE_SIZE*5//6, TILE_SIZE*2//3),
-                (TILE_SIZE*3//4, TILE_SIZE*5//6),
-                (TILE_SIZE*2//3, TILE_SIZE*2//3),
-                (TILE_SIZE//2, TILE_SIZE*5//6),
-                (TILE_SIZE//3, TILE_SIZE*2//3),
-                (TILE_SIZE//4, TILE_SIZE*5//6),
-                (TILE_SIZE//6, TILE_SIZE*2//3)
-            ]
-            pygame.draw.polygon(enemy_surf, RED, points)
-            # Ojos
-            pygame.draw.circle(enemy_surf, WHITE, (TILE_SIZE//3, TILE_SIZE//3), TILE_SIZE//8)  # Ojo izq
-            pygame.draw.circle(enemy_surf, WHITE, (TILE_SIZE*2//3, TILE_SIZE//3), TILE_SIZE//8)  # Ojo der
-            pygame.draw.circle(enemy_surf, BLACK, (TILE_SIZE//3, TILE_SIZE//3), TILE_SIZE//16)  # Pupila izq
-            pygame.draw.circle(enemy_surf, BLACK, (TILE_SIZE*2//3, TILE_SIZE//3), TILE_SIZE//16)  # Pupila der
-            self.images['enemy'] = enemy_surf
-            
-            # Jefe (púrpura, más grande y amenazante)
-            boss_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-            # Cuerpo
-            pygame.draw.circle(boss_surf, (150, 0, 150), (TILE_SIZE//2, TILE_SIZE//2), TILE_SIZE//2.2)
-            # Corona
-            points = [
-                (TILE_SIZE//4, TILE_SIZE//4),
-                (TILE_SIZE//3, TILE_SIZE//8),
-                (TILE_SIZE*2//5, TILE_SIZE//4),
-                (TILE_SIZE//2, TILE_SIZE//8),
-                (TILE_SIZE*3//5, TILE_SIZE//4),
-                (TILE_SIZE*2//3, TILE_SIZE//8),
-                (TILE_SIZE*3//4, TILE_SIZE//4)
-            ]
-            pygame.draw.polygon(boss_surf, (200, 180, 0), points)  # Corona dorada
-            # Ojos
-            pygame.draw.circle(boss_surf, RED, (TILE_SIZE//3, TILE_SIZE*2//5), TILE_SIZE//10)  # Ojo izq
-            pygame.draw.circle(boss_surf, RED, (TILE_SIZE*2//3, TILE_SIZE*2//5), TILE_SIZE//10)  # Ojo der
-            # Boca
-            pygame.draw.arc(boss_surf, WHITE, (TILE_SIZE//3, TILE_SIZE//2, TILE_SIZE//3, TILE_SIZE//4), 0, 3.14, 2)
-            self.images['boss'] = boss_surf
-            
-            # Poción (verde con forma de botella)
-            potion_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-            # Botella
-            pygame.draw.rect(potion_surf, (0, 100, 0), (TILE_SIZE*3//8, TILE_SIZE//6, TILE_SIZE//4, TILE_SIZE//8))  # Tapón
-            pygame.draw.polygon(potion_surf, (0, 180, 0), [
-                (TILE_SIZE//3, TILE_SIZE//4), 
-                (TILE_SIZE*2//3, TILE_SIZE//4), 
-                (TILE_SIZE*2//3, TILE_SIZE*3//4), 
-                (TILE_SIZE//2, TILE_SIZE*7//8), 
-                (TILE_SIZE//3, TILE_SIZE*3//4)
-            ])  # Botella
-            # Líquido
-            pygame.draw.polygon(potion_surf, (100, 255, 100), [
-                (TILE_SIZE//3 + 2, TILE_SIZE//2), 
-                (TILE_SIZE*2//3 - 2, TILE_SIZE//2), 
-                (TILE_SIZE*2//3 - 2, TILE_SIZE*3//4 - 2), 
-                (TILE_SIZE//2, TILE_SIZE*7//8 - 2), 
-                (TILE_SIZE//3 + 2, TILE_SIZE*3//4 - 2)
-            ])  # Líquido
-            # Brillo
-            pygame.draw.circle(potion_surf, (200, 255, 200), (TILE_SIZE//2, TILE_SIZE*5//8), TILE_SIZE//12)
-            self.images['potion'] = potion_surf
-            
-            # Poder (azul con forma de rayo)
-            power_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-            # Rayo
-            pygame.draw.polygon(power_surf, (50, 50, 255), [
-                (TILE_SIZE//2, TILE_SIZE//8), 
-                (TILE_SIZE*3//4, TILE_SIZE*2//5), 
-                (TILE_SIZE*3//5, TILE_SIZE*2//5), 
-                (TILE_SIZE*2//3, TILE_SIZE*7//8), 
-                (TILE_SIZE*2//5, TILE_SIZE*3//5),
-                (TILE_SIZE*2//5, TILE_SIZE*3//5),
-                (TILE_SIZE*3//5, TILE_SIZE*3//5),
-                (TILE_SIZE//4, TILE_SIZE//3)
-            ])
-            # Brillo
-            pygame.draw.polygon(power_surf, (150, 150, 255), [
-                (TILE_SIZE//2, TILE_SIZE//6), 
-                (TILE_SIZE*2//3, TILE_SIZE*2//5), 
-                (TILE_SIZE//2, TILE_SIZE//2), 
-                (TILE_SIZE*3//5, TILE_SIZE*3//4)
-            ])
-            self.images['power'] = power_surf
-            
-            # Escaleras (púrpura)
-            stairs_surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-            # Marco
-            pygame.draw.rect(stairs_surf, (100, 0, 100), (TILE_SIZE//8, TILE_SIZE//8, TILE_SIZE*3//4, TILE_SIZE*3//4), 3)
-            # Escalones
-            for i in range(1, 6):
-                y_pos = TILE_SIZE//8 + i * (TILE_SIZE*3//4) // 6
-                pygame.draw.line(stairs_surf, (150, 0, 150), 
-                               (TILE_SIZE//8, y_pos), 
-                               (TILE_SIZE*7//8, y_pos), 2)
-            # Barandilla
-            pygame.draw.line(stairs_surf, (150, 0, 150), 
-                           (TILE_SIZE//3, TILE_SIZE//8), 
-                           (TILE_SIZE//3, TILE_SIZE*7//8), 2)
-            self.images['stairs'] = stairs_surf
-            
-            # Pared (gris oscuro con textura de ladrillos)
-            wall_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
-            wall_surf.fill(DARK_GRAY)
-            # Ladrillos horizontales
-            for y in range(0, TILE_SIZE, TILE_SIZE//4):
-                pygame.draw.line(wall_surf, BLACK, (0, y), (TILE_SIZE, y), 1)
-            # Ladrillos verticales (alternados)
-            for i in range(4):
-                offset = 0 if i % 2 == 0 else TILE_SIZE//2
-                for x in range(offset, TILE_SIZE + offset, TILE_SIZE):
-                    pygame.draw.line(wall_surf, BLACK, 
-                                   (x, i * TILE_SIZE//4), 
-                                   (x, (i+1) * TILE_SIZE//4), 1)
-            self.images['wall'] = wall_surf
-            
-            # Suelo (gris con textura de baldosas)
-            floor_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
-            floor_surf.fill(GRAY)
-            # Líneas de baldosas
-            pygame.draw.line(floor_surf, DARK_GRAY, (0, TILE_SIZE//2), (TILE_SIZE, TILE_SIZE//2), 1)
-            pygame.draw.line(floor_surf, DARK_GRAY, (TILE_SIZE//2, 0), (TILE_SIZE//2, TILE_SIZE), 1)
-            # Sombras
-            pygame.draw.line(floor_surf, (80, 80, 80), (0, 0), (TILE_SIZE//2, TILE_SIZE//2), 1)
-            pygame.draw.line(floor_surf, (80, 80, 80), (TILE_SIZE, 0), (TILE_SIZE//2, TILE_SIZE//2), 1)
-            pygame.draw.line(floor_surf, (80, 80, 80), (0, TILE_SIZE), (TILE_SIZE//2, TILE_SIZE//2), 1)
-            pygame.draw.line(floor_surf, (80, 80, 80), (TILE_SIZE, TILE_SIZE), (TILE_SIZE//2, TILE_SIZE//2), 1)
-            self.images['floor'] = floor_surf
+            save_asset_bundle(ASSET_BUNDLE, self.images, key)
+        except (OSError, pygame.error) as e:
+            print(f"Warning: Could not save asset bundle {ASSET_BUNDLE}: {e}")
     
     def reset(self):
         # Reiniciar el juego
@@ -238,25 +319,25 @@ class Game:
         self.game_over = False
         self.victory = False
         
+        # Cada piso sale de su propia semilla, derivada de la de la partida, para que
+        # dé igual si se genera por adelantado en otro hilo o al llegar a él
+        self.floor_seed = self.rng.getrandbits(64)
+        self.prefetcher.clear()
+        
         # Generar el primer nivel
-        self.generate_floor()
+        plan = self.prefetcher.take(0)
         
         # Crear jugador
-        player_pos = self.get_valid_position()
-        # Pasar la imagen del jugador si está disponible
-        player_img = self.images.get('player') if self.images else None
-        self.player = Player(player_pos[0], player_pos[1], player_img)
+        # Pasar las imágenes del jugador si están disponibles
+        self.player = Player(plan.player_pos[0], plan.player_pos[1], self.sprites.get('player'),
+                             self.sprites.get('player', "power"))
         
-        # Lista de enemigos
         self.enemies = []
-        self.spawn_enemies()
-        
-        # Posición de las escaleras (mover esto antes de spawn_items)
-        self.stairs_pos = self.get_valid_position(exclude=[self.player.rect.topleft])
-        
-        # Lista de objetos
         self.items = []
-        self.spawn_items()
+        self.enter_floor(plan)
+        
+        # Empezar a preparar los pisos siguientes
+        self.prefetcher.prefetch(1)
         
         # Iniciar música
         # Comentamos esto para evitar errores con archivos de música
@@ -273,208 +354,382 @@ class Game:
             'stairs': None
         }
     
-    def generate_floor(self):
-        # Generar un nuevo piso
-        self.level_map, self.walkable_tiles = self.level_generator.generate_floor(
-            self.current_floor
-        )
+    def build_floor(self, number):
+        """Genera el FloorPlan del piso number de esta partida (se llama desde el hilo de precarga)"""
+        return build_floor(number, f"{self.floor_seed}:{number}", self.sprites, self.path_cache)
     
-    def get_valid_position(self, exclude=None):
-        if exclude is None:
-            exclude = []
-        
-        # Obtener una posición válida (en un tile caminable)
-        while True:
-            pos = self.walkable_tiles[pygame.time.get_ticks() % len(self.walkable_tiles)]
-            pixel_pos = (pos[0] * TILE_SIZE, pos[1] * TILE_SIZE)
-            
-            if pixel_pos not in exclude:
-                return pixel_pos
-    
-    def spawn_enemies(self):
-        # Limpiar lista de enemigos
-        self.enemies = []
+    @tracer.traced("Game.enter_floor")
+    def enter_floor(self, plan):
+        """
+        Coloca un piso ya generado: mapa, jugador, enemigos, escaleras y objetos
         
-        # Determinar número de enemigos según el piso
-        enemy_count = 2 + self.current_floor
+        Args:
+            plan: FloorPlan del piso (de build_floor() o del hilo de precarga)
+        """
+        self.level_map = plan.level_map
+        self.walkable_tiles = plan.walkable_tiles
+        self.planner = plan.planner
+        self.flow_field = plan.flow_field
+        self.visibility = plan.visibility
+        self.enemy_store = plan.enemy_store
         
-        # Generar enemigos
-        for _ in range(enemy_count):
-            enemy_pos = self.get_valid_position(
-                exclude=[self.player.rect.topleft] + [e.rect.topleft for e in self.enemies]
-            )
-            
-            # En el último piso, añadir un jefe
-            if self.current_floor == FLOOR_COUNT - 1 and not self.enemies:
-                # Pasar la imagen del jefe si está disponible
-                boss_img = self.images.get('boss') if self.images else None
-                self.enemies.append(Boss(enemy_pos[0], enemy_pos[1], self.level_map, self.walkable_tiles, boss_img))
-            else:
-                # Pasar la imagen del enemigo si está disponible
-                enemy_img = self.images.get('enemy') if self.images else None
-                self.enemies.append(Enemy(enemy_pos[0], enemy_pos[1], self.level_map, self.walkable_tiles, enemy_img))
-    
-    def spawn_items(self):
-        # Limpiar lista de objetos
-        self.items = []
+        # Los caminos y las entidades del piso anterior ya no son válidos
+        self.path_cache.invalidate()
+        self.spatial.clear()
         
-        # Determinar número de objetos
-        item_count = 2 + self.current_floor // 2
+        # Reposicionar jugador
+        self.player.rect.topleft = plan.player_pos
         
-        # Generar objetos
-        for _ in range(item_count):
-            item_pos = self.get_valid_position(
-                exclude=[self.player.rect.topleft, self.stairs_pos] + 
-                        [e.rect.topleft for e in self.enemies] +
-                        [i['pos'] for i in self.items]
-            )
-            
-            # Determinar tipo de objeto (poción o poder)
-            item_type = "potion" if pygame.time.get_ticks() % 2 == 0 else "power"
-            
-            self.items.append({
-                'type': item_type,
-                'pos': item_pos,
-                'rect': pygame.Rect(item_pos[0], item_pos[1], TILE_SIZE, TILE_SIZE)
-            })
+        # Enemigos y objetos del piso en la rejilla espacial (las escaleras, un solo rect, se comprueban directamente)
+        self.enemies = plan.enemies
+        for enemy in self.enemies:
+            self.spatial.insert(enemy, enemy.rect, "enemies")
+        self.place_stairs(plan.stairs_pos)
+        self.items = plan.items
+        for item in self.items:
+            self.spatial.insert(item, item['rect'], "items")
+        
+        # La cámara se limita al tamaño del piso nuevo
+        self.camera.set_world(self.level_map.width * TILE_SIZE, self.level_map.height * TILE_SIZE)
+        
+        # El fondo estático se reconstruye en el próximo draw()
+        self.background = None
+        self.dirty_rects = []
+        
+        # Sin posiciones anteriores no se interpola (evita deslizar al jugador desde el piso anterior)
+        self.previous_positions = []
+    
+    def place_stairs(self, pos):
+        # Colocar las escaleras
+        self.stairs_pos = pos
+        self.stairs_rect = pygame.Rect(pos[0], pos[1], TILE_SIZE, TILE_SIZE)
+        
+        # Las escaleras forman parte del fondo estático
+        self.background = None
     
     def handle_event(self, event):
         # Manejar eventos del juego
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 return "menu"
+            if event.key == pygame.K_F3:
+                # Mostrar u ocultar el perfilador
+                profiler.toggle()
+                return None
         
         # Pasar eventos al jugador
         self.player.handle_event(event)
         
         return None
     
-    def update(self):
+    @tracer.traced("Game.update")
+    def update(self, keys=None):
+        """
+        Avanza la partida un frame
+        
+        Args:
+            keys: Estado de las teclas para el jugador (por defecto el teclado real)
+        
+        Returns:
+            "game_over", "victory" o None
+        """
         if self.game_over:
             return "game_over"
         
         if self.victory:
             return "victory"
         
+        # Guardar las posiciones de este paso para interpolar el dibujado hasta el siguiente
+        # (se guarda la entidad y no su rect: Player.update() sustituye el rect por uno nuevo)
+        self.previous_positions = [(entity, entity.rect.x, entity.rect.y)
+                                   for entity in [self.player] + self.enemies]
+        
         # Actualizar jugador
-        self.player.update(self.level_map, self.walkable_tiles)
+        with profiler.section("update/jugador"):
+            self.player.update(self.level_map, self.walkable_tiles, keys)
         
         # Comprobar colisión con escaleras
-        stairs_rect = pygame.Rect(self.stairs_pos[0], self.stairs_pos[1], TILE_SIZE, TILE_SIZE)
-        if self.player.rect.colliderect(stairs_rect):
-            if self.sounds['stairs']:
-                self.sounds['stairs'].play()
-            self.current_floor += 1
-            
-            # Si llegamos al último piso y derrotamos al jefe, victoria
-            if self.current_floor >= FLOOR_COUNT:
-                self.victory = True
-                safe_play_music(VICTORY_MUSIC)
+        if self.player.rect.colliderect(self.stairs_rect):
+            if self.next_floor() == "victory":
                 return "victory"
+        
+        # Recalcular el campo de flujo y el de visión solo si el jugador ha cambiado de tile
+        with profiler.section("update/IA"):
+            player_tile = (self.player.rect.centerx // TILE_SIZE, self.player.rect.centery // TILE_SIZE)
+            self.flow_field.update(player_tile)
+            self.visibility.update(player_tile)
             
-            # Generar nuevo piso
-            self.generate_floor()
+            # Actualizar todos los enemigos a la vez y la posición en la rejilla espacial de los que se mueven
+            spatial = self.spatial
+            for enemy in self.enemy_store.update(self.player):
+                spatial.update(enemy, enemy.rect)
+            profiler.count("enemigos", len(self.enemies))
+        
+        with profiler.section("update/colisiones"):
+            # Comprobar colisión de los enemigos cercanos con el jugador
+            if not self.player.is_invulnerable:
+                for enemy in spatial.query(self.player.rect, "enemies"):
+                    if enemy.rect.colliderect(self.player.rect) and not self.player.is_invulnerable:
+                        self.player.take_damage(10)
+                        if self.sounds['hurt']:
+                            self.sounds['hurt'].play()
+                        
+                        # Comprobar si el jugador ha muerto
+                        if self.player.health <= 0:
+                            self.game_over = True
+                            safe_play_music(GAME_OVER_MUSIC)
+                            return "game_over"
             
-            # Reposicionar jugador
-            player_pos = self.get_valid_position()
-            self.player.rect.x, self.player.rect.y = player_pos
+            # Comprobar si el jugador ataca a los enemigos cercanos
+            if self.player.is_attacking:
+                killed = False
+                for enemy in spatial.query(self.player.attack_rect, "enemies"):
+                    if self.player.attack_rect.colliderect(enemy.rect):
+                        enemy.take_damage(20)
+                        if self.sounds['attack']:
+                            self.sounds['attack'].play()
+                        
+                        # Comprobar si el enemigo ha muerto
+                        if enemy.health <= 0:
+                            spatial.remove(enemy)
+                            killed = True
+                            if self.sounds['enemy_death']:
+                                self.sounds['enemy_death'].play()
+                
+                # Quitar los enemigos muertos de una sola pasada
+                if killed:
+                    self.enemies = self.enemy_store.remove_dead()
             
-            # Generar nuevos enemigos y objetos
-            self.spawn_enemies()
-            self.spawn_items()
+            # Comprobar colisión con objetos cercanos
+            picked = set()
+            for item in spatial.query(self.player.rect, "items"):
+                if self.player.rect.colliderect(item['rect']):
+                    if item['type'] == "potion":
+                        self.player.heal(POTION_HEAL)
+                    elif item['type'] == "power":
+                        self.player.activate_power()
+                        if self.sounds['power']:
+                            self.sounds['power'].play()
+                    
+                    spatial.remove(item)
+                    picked.add(id(item))
             
-            # Reposicionar escaleras
-            self.stairs_pos = self.get_valid_position(
-                exclude=[self.player.rect.topleft] + 
-                        [e.rect.topleft for e in self.enemies]
-            )
+            if picked:
+                self.items = [item for item in self.items if id(item) not in picked]
             
-            # Si es el último piso, cambiar música
-            if self.current_floor == FLOOR_COUNT - 1:
-                safe_play_music(BOSS_MUSIC, -1)
+        return None
+    
+    @tracer.traced("Game.next_floor")
+    def next_floor(self):
+        """
+        Sube al siguiente piso y empieza a preparar los que vienen detrás
         
-        # Actualizar enemigos
-        for enemy in self.enemies[:]:
-            enemy.update(self.player)
-            
-            # Comprobar colisión con el jugador
-            if enemy.rect.colliderect(self.player.rect) and not self.player.is_invulnerable:
-                self.player.take_damage(10)
-                if self.sounds['hurt']:
-                    self.sounds['hurt'].play()
-                
-                # Comprobar si el jugador ha muerto
-                if self.player.health <= 0:
-                    self.game_over = True
-                    safe_play_music(GAME_OVER_MUSIC)
-                    return "game_over"
-            
-            # Comprobar si el jugador ataca al enemigo
-            if self.player.is_attacking and self.player.attack_rect.colliderect(enemy.rect):
-                enemy.take_damage(20)
-                if self.sounds['attack']:
-                    self.sounds['attack'].play()
-                
-                # Comprobar si el enemigo ha muerto
-                if enemy.health <= 0:
-                    self.enemies.remove(enemy)
-                    if self.sounds['enemy_death']:
-                        self.sounds['enemy_death'].play()
-        
-        # Comprobar colisión con objetos
-        for item in self.items[:]:
-            if self.player.rect.colliderect(item['rect']):
-                if item['type'] == "potion":
-                    self.player.heal(POTION_HEAL)
-                elif item['type'] == "power":
-                    self.player.activate_power()
-                    if self.sounds['power']:
-                        self.sounds['power'].play()
-                
-                self.items.remove(item)
+        Returns:
+            "victory" si ya no quedan pisos, None en caso contrario
+        """
+        if self.sounds['stairs']:
+            self.sounds['stairs'].play()
+        self.current_floor += 1
+        tracer.instant("piso", floor=self.current_floor + 1)
+        
+        # Si llegamos al último piso y derrotamos al jefe, victoria
+        if self.current_floor >= FLOOR_COUNT:
+            self.victory = True
+            safe_play_music(VICTORY_MUSIC)
+            return "victory"
+        
+        # Entrar en el piso nuevo (normalmente ya generado en segundo plano)
+        self.enter_floor(self.prefetcher.take(self.current_floor))
+        self.prefetcher.prefetch(self.current_floor + 1)
         
+        # Si es el último piso, cambiar música
+        if self.current_floor == FLOOR_COUNT - 1:
+            safe_play_music(BOSS_MUSIC, -1)
         return None
     
-    def draw(self):
-        # Dibujar el nivel
-        for y, row in enumerate(self.level_map):
-            for x, tile in enumerate(row):
+    def build_background(self):
+        # Pre-renderizar las partes estáticas (tiles y escaleras) de la ventana de tiles visible.
+        # La ventana tiene una columna y una fila de margen para cubrir los desplazamientos
+        # de la cámara que no caen en múltiplos de TILE_SIZE
+        columns = self.camera.width // TILE_SIZE + 2
+        rows = self.camera.height // TILE_SIZE + 2
+        self.background = pygame.Surface((columns * TILE_SIZE, rows * TILE_SIZE))
+        self.background_origin = self.camera.tile_window()[:2]
+        origin_x, origin_y = self.background_origin
+        self.draw_tiles(origin_x, origin_y, origin_x + columns - 1, origin_y + rows - 1)
+        
+        # La pantalla actual ya no corresponde al fondo nuevo
+        self.full_redraw = True
+    
+    def scroll_background(self):
+        # Mover la ventana de tiles con la cámara reutilizando lo ya dibujado:
+        # se desplaza el contenido y solo se dibujan las filas y columnas nuevas
+        new_x, new_y = self.camera.tile_window()[:2]
+        old_x, old_y = self.background_origin
+        dx, dy = new_x - old_x, new_y - old_y
+        if dx == 0 and dy == 0:
+            return
+        
+        columns = self.background.get_width() // TILE_SIZE
+        rows = self.background.get_height() // TILE_SIZE
+        if abs(dx) >= columns or abs(dy) >= rows:
+            self.build_background()
+            return
+        
+        self.background.scroll(-dx * TILE_SIZE, -dy * TILE_SIZE)
+        self.background_origin = (new_x, new_y)
+        last_x = new_x + columns - 1
+        last_y = new_y + rows - 1
+        if dx > 0:
+            self.draw_tiles(last_x - dx + 1, new_y, last_x, last_y)
+        elif dx < 0:
+            self.draw_tiles(new_x, new_y, new_x - dx - 1, last_y)
+        if dy > 0:
+            self.draw_tiles(new_x, last_y - dy + 1, last_x, last_y)
+        elif dy < 0:
+            self.draw_tiles(new_x, new_y, last_x, new_y - dy - 1)
+    
+    def draw_tiles(self, x1, y1, x2, y2):
+        # Dibujar en el fondo los tiles [x1, x2] x [y1, y2]; lo que cae fuera del mapa queda en negro
+        origin_x, origin_y = self.background_origin
+        self.background.fill(BLACK, ((x1 - origin_x) * TILE_SIZE, (y1 - origin_y) * TILE_SIZE,
+                                     (x2 - x1 + 1) * TILE_SIZE, (y2 - y1 + 1) * TILE_SIZE))
+        
+        level_map = self.level_map
+        cells = level_map.cells
+        width = level_map.width
+        for tile_y in range(max(0, y1), min(level_map.height - 1, y2) + 1):
+            y = (tile_y - origin_y) * TILE_SIZE
+            row = tile_y * width
+            for tile_x in range(max(0, x1), min(width - 1, x2) + 1):
+                x = (tile_x - origin_x) * TILE_SIZE
+                tile = cells[row + tile_x]
                 if self.images:
                     if tile == 1:  # Pared
-                        self.screen.blit(self.images['wall'], (x * TILE_SIZE, y * TILE_SIZE))
+                        self.background.blit(self.images['wall'], (x, y))
                     else:  # Suelo
-                        self.screen.blit(self.images['floor'], (x * TILE_SIZE, y * TILE_SIZE))
+                        self.background.blit(self.images['floor'], (x, y))
                 else:
                     if tile == 1:  # Pared (fallback)
-                        pygame.draw.rect(self.screen, DARK_GRAY, (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+                        pygame.draw.rect(self.background, DARK_GRAY, (x, y, TILE_SIZE, TILE_SIZE))
                     else:  # Suelo (fallback)
-                        pygame.draw.rect(self.screen, GRAY, (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-        
-        # Dibujar escaleras
-        if self.images:
-            self.screen.blit(self.images['stairs'], self.stairs_pos)
-        else:
-            pygame.draw.rect(self.screen, PURPLE, (self.stairs_pos[0], self.stairs_pos[1], TILE_SIZE, TILE_SIZE))
+                        pygame.draw.rect(self.background, GRAY, (x, y, TILE_SIZE, TILE_SIZE))
         
-        # Dibujar objetos
-        for item in self.items:
+        # Dibujar escaleras si caen dentro del rango
+        stairs_x = self.stairs_pos[0] // TILE_SIZE
+        stairs_y = self.stairs_pos[1] // TILE_SIZE
+        if x1 <= stairs_x <= x2 and y1 <= stairs_y <= y2:
+            pos = (self.stairs_pos[0] - origin_x * TILE_SIZE, self.stairs_pos[1] - origin_y * TILE_SIZE)
             if self.images:
-                self.screen.blit(self.images[item['type']], item['pos'])
+                self.background.blit(self.images['stairs'], pos)
             else:
-                if item['type'] == "potion":
-                    pygame.draw.rect(self.screen, GREEN, (item['pos'][0], item['pos'][1], TILE_SIZE, TILE_SIZE))
-                else:
-                    pygame.draw.rect(self.screen, BLUE, (item['pos'][0], item['pos'][1], TILE_SIZE, TILE_SIZE))
+                pygame.draw.rect(self.background, PURPLE, (pos[0], pos[1], TILE_SIZE, TILE_SIZE))
+    
+    def request_full_redraw(self):
+        # Repintar todo el fondo en el próximo frame (p. ej. si otra escena ha borrado la pantalla)
+        self.full_redraw = True
+    
+    def interpolate(self, alpha):
+        """
+        Coloca el jugador y los enemigos entre su posición del paso anterior y la actual
         
-        # Dibujar enemigos
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        Args:
+            alpha: Fracción del paso de simulación transcurrida (0 = paso anterior, 1 = actual)
+        
+        Returns:
+            Lista de (rect, x, y) con las posiciones reales, para restaurarlas después de dibujar
+        """
+        moved = []
+        if alpha >= 1:
+            return moved
+        for entity, x, y in self.previous_positions:
+            rect = entity.rect
+            current_x, current_y = rect.x, rect.y
+            if current_x != x or current_y != y:
+                moved.append((rect, current_x, current_y))
+                rect.x = round(x + (current_x - x) * alpha)
+                rect.y = round(y + (current_y - y) * alpha)
+        return moved
+    
+    @tracer.traced("Game.draw")
+    def draw(self, alpha=1.0):
+        """
+        Dibuja el frame restaurando el fondo solo donde hace falta
+        
+        Args:
+            alpha: Fracción del paso de simulación transcurrida, para interpolar las entidades
+        
+        Returns:
+            Lista de rectángulos de pantalla que han cambiado en este frame
+        """
+        # Dibujar las entidades en su posición interpolada y devolverlas después a la real
+        moved = self.interpolate(alpha)
+        
+        camera = self.camera
         
-        # Dibujar jugador
-        self.player.draw(self.screen)
+        # Si la cámara se mueve cambia toda la pantalla
+        camera_moved = camera.follow(self.player.rect)
+        
+        # Reconstruir el fondo si ha cambiado el piso o las escaleras, o desplazarlo con la cámara
+        if self.background is None:
+            self.build_background()
+        elif camera_moved:
+            self.scroll_background()
+        
+        # Posición en pantalla de la esquina del fondo
+        background_offset = camera.apply_pos((self.background_origin[0] * TILE_SIZE,
+                                              self.background_origin[1] * TILE_SIZE))
+        
+        full_redraw = self.full_redraw or camera_moved
+        with profiler.section("draw/fondo"):
+            if full_redraw:
+                self.screen.blit(self.background, background_offset)
+                self.full_redraw = False
+                profiler.count("blits")
+            else:
+                # Restaurar solo las zonas que ensuciaron los sprites en el frame anterior
+                for rect in self.dirty_rects:
+                    self.screen.blit(self.background, rect,
+                                     rect.move(-background_offset[0], -background_offset[1]))
+                profiler.count("blits", len(self.dirty_rects))
+        
+        dirty_rects = []
+        queue = self.render_queue
+        
+        with profiler.section("draw/sprites"):
+            # Dibujar objetos visibles
+            for item in self.items:
+                if not camera.is_visible(item['rect']):
+                    continue
+                rect = camera.apply(item['rect'])
+                if self.images:
+                    queue.add(self.images[item['type']], rect.topleft, layer=LAYER_ITEMS)
+                else:
+                    queue.add_fill(rect, GREEN if item['type'] == "potion" else BLUE, LAYER_ITEMS)
+                dirty_rects.append(rect)
+            
+            # Dibujar enemigos visibles (con margen para la barra de salud)
+            for enemy in self.enemies:
+                if camera.is_visible(enemy.rect.inflate(0, 20)):
+                    dirty_rects.append(enemy.draw(self.screen, camera, queue))
+            
+            # Dibujar jugador
+            dirty_rects.append(self.player.draw(self.screen, camera, queue))
+            
+            # Enviar todos los sprites del frame de una vez, ordenados por capa
+            profiler.count("blits", queue.flush(self.screen))
         
         # Dibujar HUD
-        self.draw_hud()
+        with profiler.section("draw/HUD"):
+            dirty_rects.extend(self.draw_hud())
+        
+        # Han cambiado las zonas restauradas y las recién dibujadas
+        changed = [self.screen.get_rect()] if full_redraw else self.dirty_rects + dirty_rects
+        self.dirty_rects = dirty_rects
+        
+        for rect, x, y in moved:
+            rect.x, rect.y = x, y
+        return changed
     
     def draw_hud(self):
         # Dibujar barra de salud
@@ -482,14 +737,22 @@ class Game:
         health_percentage = max(0, self.player.health / PLAYER_HEALTH)
         pygame.draw.rect(self.screen, RED, (20, 20, health_bar_width, 20))
         pygame.draw.rect(self.screen, GREEN, (20, 20, health_bar_width * health_percentage, 20))
-        pygame.draw.rect(self.screen, WHITE, (20, 20, health_bar_width, 20), 2)
+        dirty_rects = [pygame.draw.rect(self.screen, WHITE, (20, 20, health_bar_width, 20), 2)]
         
         # Mostrar piso actual
-        font = pygame.font.SysFont(None, 36)
-        floor_text = font.render(f"Piso: {self.current_floor + 1}/{FLOOR_COUNT}", True, WHITE)
-        self.screen.blit(floor_text, (SCREEN_WIDTH - floor_text.get_width() - 20, 20))
+        font = self.text_cache.font(36)
+        floor_text = self.text_cache.render(f"Piso: {self.current_floor + 1}/{FLOOR_COUNT}", font, WHITE)
+        dirty_rects.append(self.screen.blit(floor_text, (SCREEN_WIDTH - floor_text.get_width() - 20, 20)))
         
-        # Mostrar poderes activos
+        # Mostrar poderes activos (el tiempo cambia cada frame: se compone con glifos cacheados)
         if self.player.power_active:
-            power_text = font.render(f"Poder: {self.player.power_time:.1f}s", True, BLUE)
-            self.screen.blit(power_text, (20, 50)) 
\ No newline at end of file
+            power_label = self.text_cache.render("Poder: ", font, BLUE)
+            dirty_rects.append(self.screen.blit(power_label, (20, 50)))
+            dirty_rects.append(self.text_cache.blit_glyphs(self.screen, f"{self.player.power_time:.1f}s", font, BLUE,
+                                                           (20 + power_label.get_width(), 50)))
+        
+        # Superposición del perfilador (F3)
+        if profiler.enabled:
+            dirty_rects.append(profiler.draw(self.screen, self.text_cache))
+        
+        return dirty_rects
\ No newline at end of file
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# Simulación sin ventana de La Torre Maldita a paso fijo
+#
+# Uso: python -m src.headless [--ticks N] [--seed S] [--input random|idle] [--script archivo.json]
+#                             [--trace traza.json]
+#
+# El guion JSON es una lista de pasos [ticks, [teclas mantenidas], [teclas pulsadas]],
+# con nombres de KEY_NAMES, p. ej. [[30, ["right"], []], [1, [], ["space"]]]
+
+import argparse
+import json
+import random
+import time
+import pygame
+from src.ai import astar as pathfinding
+from src.game import Game
+from src.utils.clock import SimClock, set_clock
+from src.utils.tracer import tracer
+from src.utils.constants import *
+
+# Teclas que entiende el juego, por nombre (para los guiones)
+KEY_NAMES = {
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "space": pygame.K_SPACE,
+    "escape": pygame.K_ESCAPE,
+}
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+class KeyState:
+    """Estado de teclas indexable como el resultado de pygame.key.get_pressed()"""
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput:
+    """
+    Entrada guionizada
+
+    Cada paso es (ticks, teclas mantenidas, teclas pulsadas): las teclas
+    mantenidas se mantienen durante ticks frames y las pulsadas generan un
+    KEYDOWN en el primero de ellos. Al terminar el guion vuelve a empezar si
+    loop es True; si no, deja de pulsar teclas.
+    """
+    def __init__(self, steps, loop=True):
+        self.steps = [(ticks, [KEY_NAMES[name] for name in held], [KEY_NAMES[name] for name in pressed])
+                      for ticks, held, pressed in steps]
+        self.loop = loop
+        self.index = 0
+        self.remaining = self.steps[0][0] if self.steps else 0
+        self.started = False
+
+    def next(self):
+        """Devuelve (KeyState, lista de eventos) para el siguiente tick"""
+        if self.index >= len(self.steps):
+            return KeyState(), []
+
+        ticks, held, pressed = self.steps[self.index]
+        events = []
+        if not self.started:
+            events = [pygame.event.Event(pygame.KEYDOWN, key=key) for key in pressed]
+            self.started = True
+        keys = KeyState(held)
+
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.index += 1
+            if self.index >= len(self.steps) and self.loop:
+                self.index = 0
+            if self.index < len(self.steps):
+                self.remaining = self.steps[self.index][0]
+            self.started = False
+        return keys, events
+
+
+class RandomInput:
+    """Paseo aleatorio para pruebas de resistencia: cambia de dirección cada poco y ataca a ratos"""
+    def __init__(self, rng, hold_ticks=(10, 60), attack_chance=0.05):
+        self.rng = rng
+        self.hold_ticks = hold_ticks
+        self.attack_chance = attack_chance
+        self.keys = KeyState()
+        self.remaining = 0
+
+    def next(self):
+        if self.remaining <= 0:
+            self.remaining = self.rng.randint(*self.hold_ticks)
+            direction = self.rng.choice(DIRECTIONS + (None,))
+            self.keys = KeyState([KEY_NAMES[direction]] if direction else [])
+        self.remaining -= 1
+
+        events = []
+        if self.rng.random() < self.attack_chance:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        return self.keys, events
+
+
+def run(ticks=10000, seed=1234, input_source=None, step_ms=SIM_STEP_MS):
+    """
+    Ejecuta ticks frames de la partida sin ventana y a paso fijo
+
+    Args:
+        ticks: Número de frames a simular
+        seed: Semilla de la partida (pisos, enemigos, objetos y entrada aleatoria)
+        input_source: Objeto con next() -> (teclas, eventos); por defecto RandomInput
+        step_ms: Duración simulada de cada frame
+
+    Returns:
+        Diccionario con las estadísticas de la simulación
+    """
+    pygame.font.init()
+    rng = random.Random(seed)
+    if input_source is None:
+        input_source = RandomInput(random.Random(seed + 1))
+
+    clock = SimClock(step_ms)
+    previous_clock = set_clock(clock)
+    try:
+        game = Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), rng=rng)
+        pathfinding.reset_stats()
+        results = {'game_over': 0, 'victory': 0}
+        deepest_floor = 0
+
+        start = time.perf_counter()
+        for _ in range(ticks):
+            tracer.frame()
+            keys, events = input_source.next()
+            for event in events:
+                game.handle_event(event)
+
+            state = game.update(keys)
+            deepest_floor = max(deepest_floor, game.current_floor)
+            if state in results:
+                results[state] += 1
+                game.reset()
+            clock.advance()
+        elapsed = time.perf_counter() - start
+    finally:
+        set_clock(previous_clock)
+
+    return {
+        'ticks': ticks,
+        'seconds': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed else 0.0,
+        'simulated_seconds': clock.time(),
+        'game_over': results['game_over'],
+        'victory': results['victory'],
+        'deepest_floor': deepest_floor + 1,
+        'searches': pathfinding.stats['searches'],
+        'expanded': pathfinding.stats['expanded'],
+        'path_cache': game.path_cache.get_stats(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación sin ventana de La Torre Maldita")
+    parser.add_argument("--ticks", type=int, default=10000, help="frames a simular")
+    parser.add_argument("--seed", type=int, default=1234, help="semilla de la partida")
+    parser.add_argument("--input", choices=["random", "idle"], default="random", help="entrada si no hay guion")
+    parser.add_argument("--script", help="guion JSON de entrada (se repite en bucle)")
+    parser.add_argument("--trace", help="grabar los spans y guardarlos en este JSON de traza de Chrome")
+    args = parser.parse_args()
+
+    input_source = None
+    if args.script:
+        with open(args.script) as script:
+            input_source = ScriptedInput(json.load(script))
+    elif args.input == "idle":
+        input_source = ScriptedInput([])
+
+    if args.trace:
+        tracer.start()
+    stats = run(args.ticks, args.seed, input_source)
+    if args.trace:
+        tracer.stop()
+        tracer.dump(args.trace)
+    print(f"{stats['ticks']} ticks en {stats['seconds']:.2f} s ({stats['ticks_per_second']:.0f} ticks/s, "
+          f"{stats['simulated_seconds']:.0f} s simulados)")
+    print(f"derrotas: {stats['game_over']}  victorias: {stats['victory']}  piso más alto: {stats['deepest_floor']}")
+    print(f"búsquedas A*: {stats['searches']}  nodos expandidos: {stats['expanded']}")
+    print(f"caché de caminos: {stats['path_cache']}")
+
+if __name__ == "__main__":
+    main()
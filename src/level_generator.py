@@ -1,31 +1,44 @@
 import random
+from src.level_grid import LevelGrid
 from src.utils.constants import *
 
 class LevelGenerator:
-    def __init__(self):
-        pass
+    def __init__(self, rng=None):
+        # Generador aleatorio (random.Random con semilla para pisos reproducibles; por defecto el global)
+        self.rng = rng if rng is not None else random
+        
+        # Datos estructurales del último piso generado
+        self.rooms = []
+        self.corridors = []
     
-    def generate_floor(self, floor_number):
+    def generate_floor(self, floor_number, width=None, height=None):
         """
         Genera un nuevo piso de la torre
         
         Args:
             floor_number: Número del piso actual (0-indexed)
+            width, height: Tamaño del mapa en tiles (por defecto crece con el piso)
         
         Returns:
             Tupla (level_map, walkable_tiles) donde:
-            - level_map es una matriz 2D que representa el mapa (1 = pared, 0 = suelo)
+            - level_map es un LevelGrid que representa el mapa (1 = pared, 0 = suelo)
             - walkable_tiles es una lista de tuplas (x, y) con las posiciones de los tiles caminables
+        
+        Además deja en self.rooms las habitaciones (x, y, ancho, alto) y en
+        self.corridors las uniones (i, j) entre habitaciones, a partir de las
+        que HierarchicalPlanner construye el grafo de habitaciones y portales.
         """
         # Determinar tamaño del mapa según el piso
-        width = 25 + floor_number * 2
-        height = 20 + floor_number * 2
+        if width is None:
+            width = 25 + floor_number * 2
+        if height is None:
+            height = 20 + floor_number * 2
         
         # Crear mapa vacío (todo paredes)
-        level_map = [[1 for _ in range(width)] for _ in range(height)]
+        level_map = LevelGrid(width, height, 1)
         
         # Determinar número de habitaciones
-        num_rooms = random.randint(MIN_ROOMS, MAX_ROOMS)
+        num_rooms = self.rng.randint(MIN_ROOMS, MAX_ROOMS)
         
         # Lista para almacenar las habitaciones
         rooms = []
@@ -33,22 +46,21 @@ class LevelGenerator:
         # Generar habitaciones
         for _ in range(num_rooms):
             # Tamaño aleatorio de la habitación
-            room_width = random.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
-            room_height = random.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
+            room_width = self.rng.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
+            room_height = self.rng.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
             
             # Posición aleatoria (asegurando que esté dentro del mapa)
-            x = random.randint(1, width - room_width - 1)
-            y = random.randint(1, height - room_height - 1)
+            x = self.rng.randint(1, width - room_width - 1)
+            y = self.rng.randint(1, height - room_height - 1)
             
             # Crear la habitación (establecer tiles como suelo)
-            for i in range(y, y + room_height):
-                for j in range(x, x + room_width):
-                    level_map[i][j] = 0
+            level_map.fill_rect(x, y, room_width, room_height, 0)
             
             # Guardar la habitación
             rooms.append((x, y, room_width, room_height))
         
         # Conectar habitaciones con pasillos
+        corridors = []
         for i in range(len(rooms) - 1):
             # Obtener centros de las habitaciones
             x1 = rooms[i][0] + rooms[i][2] // 2
@@ -57,7 +69,7 @@ class LevelGenerator:
             y2 = rooms[i + 1][1] + rooms[i + 1][3] // 2
             
             # Crear pasillo horizontal y luego vertical (o viceversa)
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 # Horizontal y luego vertical
                 self._create_horizontal_tunnel(level_map, x1, x2, y1)
                 self._create_vertical_tunnel(level_map, y1, y2, x2)
@@ -65,22 +77,22 @@ class LevelGenerator:
                 # Vertical y luego horizontal
                 self._create_vertical_tunnel(level_map, y1, y2, x1)
                 self._create_horizontal_tunnel(level_map, x1, x2, y2)
+            
+            corridors.append((i, i + 1))
         
         # Recopilar tiles caminables
-        walkable_tiles = []
-        for y in range(height):
-            for x in range(width):
-                if level_map[y][x] == 0:
-                    walkable_tiles.append((x, y))
+        walkable_tiles = level_map.walkable_tiles
+        
+        # Conservar la estructura del piso para el grafo abstracto
+        self.rooms = rooms
+        self.corridors = corridors
         
         return level_map, walkable_tiles
     
     def _create_horizontal_tunnel(self, level_map, x1, x2, y):
         """Crea un pasillo horizontal entre x1 y x2 en la fila y"""
-        for x in range(min(x1, x2), max(x1, x2) + 1):
-            level_map[y][x] = 0
+        level_map.fill_row(min(x1, x2), max(x1, x2), y, 0)
     
     def _create_vertical_tunnel(self, level_map, y1, y2, x):
         """Crea un pasillo vertical entre y1 e y2 en la columna x"""
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            level_map[y][x] = 0 
\ No newline at end of file
+        level_map.fill_column(min(y1, y2), max(y1, y2), x, 0) 
\ No newline at end of file
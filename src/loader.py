@@ -0,0 +1,62 @@
+import threading
+import time
+import traceback
+from src.game import Game
+
+class GameLoader:
+    """
+    Construye el Game en un hilo aparte para poder mostrar el menú al instante
+
+    Game avisa al terminar cada fase de su inicialización (imágenes, atlas,
+    primer piso, audio); el cargador guarda la fase y la fracción completada
+    para la barra de progreso del menú y registra cuánto ha tardado cada una.
+    """
+    def __init__(self, screen, text_cache):
+        self.screen = screen
+        self.text_cache = text_cache
+        self.game = None
+        self.error = None
+        self.phase = "starting"
+        self.progress = 0.0
+        # Lista de (fase, segundos) en el orden en que terminaron
+        self.timings = []
+        self._phase_start = None
+        self._thread = threading.Thread(target=self._run, name="game-loader", daemon=True)
+
+    @property
+    def ready(self):
+        return self.game is not None
+
+    def start(self):
+        self._started = self._phase_start = time.perf_counter()
+        self._thread.start()
+
+    def poll(self):
+        """
+        Devuelve el Game si ya está listo o None si sigue cargando
+
+        Si la carga ha fallado, relanza el error en el hilo que llama.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.game
+
+    def report(self, phase, progress):
+        """Callback de progreso de Game: phase acaba de terminar y progress está completado"""
+        now = time.perf_counter()
+        elapsed = now - self._phase_start
+        self._phase_start = now
+        self.timings.append((phase, elapsed))
+        print(f"Startup: {phase} loaded in {elapsed * 1000:.1f} ms")
+        self.phase = phase
+        self.progress = progress
+
+    def _run(self):
+        try:
+            game = Game(self.screen, self.text_cache, self.report)
+        except Exception as e:
+            traceback.print_exc()
+            self.error = e
+            return
+        print(f"Startup: game ready in {(time.perf_counter() - self._started) * 1000:.1f} ms")
+        self.game = game
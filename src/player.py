@@ -1,9 +1,11 @@
 import pygame
-import time
+from src.utils import clock
 from src.utils.constants import *
+from src.utils.render_queue import RenderQueue, LAYER_PLAYER
+from src.utils.sprites import POWER_TINT, outline, tint
 
 class Player:
-    def __init__(self, x, y, image=None):
+    def __init__(self, x, y, image=None, power_image=None):
         self.rect = pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE)
         self.health = PLAYER_HEALTH
         self.speed = PLAYER_SPEED
@@ -15,8 +17,11 @@ class Player:
         self.is_invulnerable = False
         self.invulnerable_timer = 0
         
-        # Imagen del jugador
+        # Imagen del jugador y su variante tintada para el poder activo
         self.image = image
+        if power_image is None and image is not None:
+            power_image = tint(image, POWER_TINT)
+        self.power_image = power_image
         
         # Poderes
         self.power_active = False
@@ -31,9 +36,10 @@ class Player:
             if event.key == pygame.K_SPACE:
                 self.attack()
     
-    def update(self, level_map, walkable_tiles):
-        # Movimiento
-        keys = pygame.key.get_pressed()
+    def update(self, level_map, walkable_tiles, keys=None):
+        # Movimiento (teclado real, o el estado de teclas que se pase, p. ej. en modo headless)
+        if keys is None:
+            keys = pygame.key.get_pressed()
         dx, dy = 0, 0
         
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -66,20 +72,13 @@ class Player:
         new_rect.y += dy
         
         # Convertir posición de píxeles a coordenadas de tile
-        tile_x1 = max(0, new_rect.left // TILE_SIZE)
-        tile_y1 = max(0, new_rect.top // TILE_SIZE)
-        tile_x2 = min(len(level_map[0]) - 1, new_rect.right // TILE_SIZE)
-        tile_y2 = min(len(level_map) - 1, new_rect.bottom // TILE_SIZE)
-        
-        # Comprobar si hay colisión con paredes
-        collision = False
-        for y in range(tile_y1, tile_y2 + 1):
-            for x in range(tile_x1, tile_x2 + 1):
-                if level_map[y][x] == 1:  # 1 representa una pared
-                    collision = True
-                    break
-            if collision:
-                break
+        tile_x1 = new_rect.left // TILE_SIZE
+        tile_y1 = new_rect.top // TILE_SIZE
+        tile_x2 = new_rect.right // TILE_SIZE
+        tile_y2 = new_rect.bottom // TILE_SIZE
+        
+        # Comprobar si hay colisión con paredes (el LevelGrid recorta a los límites del mapa)
+        collision = level_map.has_wall_in(tile_x1, tile_y1, tile_x2, tile_y2)
         
         # Actualizar posición si no hay colisión
         if not collision:
@@ -102,7 +101,7 @@ class Player:
         
         # Actualizar temporizador de poder
         if self.power_active:
-            current_time = time.time()
+            current_time = clock.now()
             elapsed = current_time - self.power_start_time
             self.power_time = max(0, POWER_DURATION - elapsed)
             
@@ -136,28 +135,43 @@ class Player:
     
     def activate_power(self):
         self.power_active = True
-        self.power_start_time = time.time()
+        self.power_start_time = clock.now()
         self.power_time = POWER_DURATION
     
-    def draw(self, screen):
+    def draw(self, screen, camera=None, queue=None):
+        # Sin cola de dibujado se dibuja inmediatamente con una cola propia
+        own_queue = queue is None
+        if own_queue:
+            queue = RenderQueue()
+        
+        # Posición en pantalla (con cámara, las coordenadas del jugador son del mundo)
+        rect = camera.apply(self.rect) if camera else self.rect.copy()
+        
         # Dibujar jugador con efecto de parpadeo si está invulnerable
-        if not self.is_invulnerable or pygame.time.get_ticks() % 200 < 100:
+        if not self.is_invulnerable or clock.get_ticks() % 200 < 100:
             if self.image:
                 # Si hay imagen disponible, usarla
                 if self.power_active:
-                    # Crear una copia con tinte azul para el poder activo
-                    power_img = self.image.copy()
-                    power_img.fill((0, 100, 255, 128), special_flags=pygame.BLEND_RGBA_MULT)
-                    screen.blit(power_img, self.rect.topleft)
+                    # Variante con tinte azul para el poder activo
+                    queue.add(self.power_image, rect.topleft, layer=LAYER_PLAYER)
                 else:
-                    screen.blit(self.image, self.rect.topleft)
+                    queue.add(self.image, rect.topleft, layer=LAYER_PLAYER)
             else:
                 # Fallback: dibujar rectángulo si no hay imagen
                 if self.power_active:
-                    pygame.draw.rect(screen, (0, 100, 255), self.rect)
+                    queue.add_fill(rect, (0, 100, 255), LAYER_PLAYER)
                 else:
-                    pygame.draw.rect(screen, self.color, self.rect)
+                    queue.add_fill(rect, self.color, LAYER_PLAYER)
         
-        # Dibujar área de ataque si está atacando
+        # Dibujar área de ataque si está atacando (contorno pre-renderizado)
+        dirty_rect = rect
         if self.is_attacking:
-            pygame.draw.rect(screen, RED, self.attack_rect, 2) 
\ No newline at end of file
+            attack_rect = camera.apply(self.attack_rect) if camera else self.attack_rect.copy()
+            queue.add(outline(attack_rect.size, RED, 2), attack_rect.topleft, layer=LAYER_PLAYER)
+            dirty_rect = rect.union(attack_rect)
+        
+        if own_queue:
+            queue.flush(screen)
+        
+        # Zona ensuciada (copia, porque self.rect cambia en el siguiente update)
+        return dirty_rect
\ No newline at end of file
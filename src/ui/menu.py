@@ -2,12 +2,15 @@ import pygame
 from src.utils.constants import *
 
 class Menu:
-    def __init__(self, screen, game):
+    def __init__(self, screen, loader, text_cache):
         self.screen = screen
-        self.game = game
-        self.font_large = pygame.font.SysFont(None, 72)
-        self.font_medium = pygame.font.SysFont(None, 48)
-        self.font_small = pygame.font.SysFont(None, 36)
+        # El juego se carga en segundo plano: "Iniciar Juego" espera a que esté listo
+        self.loader = loader
+        # Las fuentes y los textos renderizados vienen de la caché compartida con el juego
+        self.text_cache = text_cache
+        self.font_large = self.text_cache.font(72)
+        self.font_medium = self.text_cache.font(48)
+        self.font_small = self.text_cache.font(36)
         
         # Comentamos la carga de música para evitar errores
         # pygame.mixer.music.load(MENU_MUSIC)
@@ -26,6 +29,8 @@ class Menu:
                 self.selected_option = (self.selected_option + 1) % len(self.options)
             elif event.key == pygame.K_RETURN:
                 if self.selected_option == 0:  # Iniciar Juego
+                    if not self.loader.ready:
+                        return None
                     # pygame.mixer.music.stop()
                     return "game"
                 elif self.selected_option == 1:  # Salir
@@ -55,55 +60,72 @@ class Menu:
     def update_victory(self):
         pass
     
+    def draw_text(self, text, font, color, center):
+        """Dibuja un texto centrado en center borrando antes su fondo; devuelve su rectángulo"""
+        surface = self.text_cache.render(text, font, color)
+        rect = surface.get_rect(center=center)
+        self.screen.fill(BLACK, rect)
+        self.screen.blit(surface, rect)
+        return rect
+    
     def draw(self):
         # Dibujar título
-        title = self.font_large.render("LA TORRE MALDITA", True, RED)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-        self.screen.blit(title, title_rect)
+        rects = [self.draw_text("LA TORRE MALDITA", self.font_large, RED, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))]
         
-        # Dibujar opciones
+        # Dibujar opciones ("Iniciar Juego" en gris mientras el juego se carga)
         for i, option in enumerate(self.options):
             color = WHITE if i != self.selected_option else GREEN
-            text = self.font_medium.render(option, True, color)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 60))
-            self.screen.blit(text, text_rect)
+            if i == 0 and not self.loader.ready:
+                color = GRAY
+            rects.append(self.draw_text(option, self.font_medium, color, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 60)))
         
         # Dibujar instrucciones
-        instructions = self.font_small.render("Usa las flechas para moverte y ESPACIO para atacar", True, WHITE)
-        instructions_rect = instructions.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4))
-        self.screen.blit(instructions, instructions_rect)
+        rects.append(self.draw_text("Usa las flechas para moverte y ESPACIO para atacar", self.font_small, WHITE,
+                                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4)))
+        
+        # Dibujar progreso de carga
+        rects.append(self.draw_loading())
+        return rects
+    
+    def draw_loading(self):
+        # Franja inferior con la barra de progreso; cuando termina la carga solo se borra
+        band = pygame.Rect(0, SCREEN_HEIGHT * 7 // 8 - 20, SCREEN_WIDTH, 40)
+        self.screen.fill(BLACK, band)
+        if self.loader.ready:
+            return band
+        
+        bar_width = 300
+        bar = pygame.Rect(SCREEN_WIDTH // 2 - bar_width // 2, band.top + 4, bar_width, 8)
+        pygame.draw.rect(self.screen, GREEN, (bar.x, bar.y, int(bar_width * self.loader.progress), bar.height))
+        pygame.draw.rect(self.screen, WHITE, bar, 1)
+        
+        text = f"Cargando... {int(self.loader.progress * 100)}%"
+        text_surface = self.text_cache.render(text, self.font_small, GRAY)
+        self.screen.blit(text_surface, text_surface.get_rect(midtop=(SCREEN_WIDTH // 2, bar.bottom + 2)))
+        return band
     
     def draw_game_over(self):
         # Dibujar mensaje de game over
-        game_over = self.font_large.render("GAME OVER", True, RED)
-        game_over_rect = game_over.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-        self.screen.blit(game_over, game_over_rect)
+        rects = [self.draw_text("GAME OVER", self.font_large, RED, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))]
         
         # Dibujar opciones
-        restart = self.font_medium.render("Presiona R para reiniciar", True, WHITE)
-        restart_rect = restart.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(restart, restart_rect)
-        
-        menu = self.font_medium.render("Presiona M para volver al menú", True, WHITE)
-        menu_rect = menu.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
-        self.screen.blit(menu, menu_rect)
+        rects.append(self.draw_text("Presiona R para reiniciar", self.font_medium, WHITE,
+                                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+        rects.append(self.draw_text("Presiona M para volver al menú", self.font_medium, WHITE,
+                                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60)))
+        return rects
     
     def draw_victory(self):
         # Dibujar mensaje de victoria
-        victory = self.font_large.render("¡VICTORIA!", True, GREEN)
-        victory_rect = victory.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-        self.screen.blit(victory, victory_rect)
+        rects = [self.draw_text("¡VICTORIA!", self.font_large, GREEN, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))]
         
         # Dibujar mensaje
-        message = self.font_medium.render("Has escapado de la Torre Maldita", True, WHITE)
-        message_rect = message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(message, message_rect)
+        rects.append(self.draw_text("Has escapado de la Torre Maldita", self.font_medium, WHITE,
+                                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
         
         # Dibujar opciones
-        restart = self.font_medium.render("Presiona R para jugar de nuevo", True, WHITE)
-        restart_rect = restart.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
-        self.screen.blit(restart, restart_rect)
-        
-        menu = self.font_medium.render("Presiona M para volver al menú", True, WHITE)
-        menu_rect = menu.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
-        self.screen.blit(menu, menu_rect) 
\ No newline at end of file
+        rects.append(self.draw_text("Presiona R para jugar de nuevo", self.font_medium, WHITE,
+                                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60)))
+        rects.append(self.draw_text("Presiona M para volver al menú", self.font_medium, WHITE,
+                                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120)))
+        return rects
\ No newline at end of file
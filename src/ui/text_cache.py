@@ -0,0 +1,110 @@
+from collections import OrderedDict
+import pygame
+from src.utils.atlas import to_display_format
+from src.utils.constants import *
+
+class TextCache:
+    """
+    Caché de fuentes y de textos renderizados para el HUD y los menús
+
+    Las fuentes se cargan una sola vez (las de FONT_SIZES al crear la caché)
+    y las superficies renderizadas se guardan en una caché LRU acotada con
+    clave (texto, fuente, color), así que los textos que no cambian solo se
+    renderizan la primera vez que se dibujan.
+
+    Para los textos que cambian casi cada frame (p. ej. el tiempo de poder)
+    está blit_glyphs(), que compone el texto con las superficies cacheadas de
+    cada carácter en lugar de renderizar la cadena completa.
+    """
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        # (carácter, fuente, color) -> superficie; crece con el juego de caracteres usado, no con los textos
+        self.glyphs = {}
+
+        # Contadores para dimensionar la caché
+        self.hits = 0
+        self.misses = 0
+
+        for size in FONT_SIZES:
+            self.font(size)
+
+    def font(self, size):
+        """Devuelve la fuente por defecto del tamaño indicado, cargándola solo la primera vez"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.SysFont(None, size)
+        return font
+
+    def render(self, text, font, color):
+        """
+        Devuelve la superficie de text, renderizándola solo si no está en caché
+
+        Args:
+            text: Cadena a renderizar
+            font: Fuente obtenida con font()
+            color: Color del texto
+
+        Returns:
+            pygame.Surface compartida (no debe modificarse)
+        """
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = to_display_format(font.render(text, True, color), alpha=True)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def blit_glyphs(self, target, text, font, color, pos):
+        """
+        Dibuja text carácter a carácter con las superficies cacheadas de cada uno
+
+        Pensado para cifras que cambian continuamente; no aplica kerning, así
+        que el resultado puede diferir en algún píxel de render().
+
+        Args:
+            target: Superficie destino
+            text: Cadena a dibujar
+            font: Fuente obtenida con font()
+            color: Color del texto
+            pos: Tupla (x, y) de la esquina superior izquierda
+
+        Returns:
+            pygame.Rect con la zona dibujada
+        """
+        glyphs = self.glyphs
+        x, y = pos
+        height = 0
+        for char in text:
+            key = (char, font, color)
+            glyph = glyphs.get(key)
+            if glyph is None:
+                glyph = glyphs[key] = to_display_format(font.render(char, True, color), alpha=True)
+            target.blit(glyph, (x, y))
+            x += glyph.get_width()
+            height = max(height, glyph.get_height())
+        return pygame.Rect(pos[0], pos[1], x - pos[0], height)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.glyphs.clear()
+
+    def get_stats(self):
+        """Devuelve los contadores de aciertos y fallos de la caché"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.surfaces),
+            'max_size': self.max_size,
+            'glyphs': len(self.glyphs),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,156 @@
+import hashlib
+import importlib.util
+import inspect
+import marshal
+import mmap
+import os
+import struct
+import pygame
+from src.utils.constants import *
+
+# Formato del paquete:
+#   cabecera: MAGIC, versión, TILE_SIZE, número de imágenes, clave de origen (sha256)
+#   índice: por imagen, longitud del nombre, nombre, ancho, alto y desplazamiento
+#   datos: píxeles RGBA sin comprimir de cada imagen, alineados a 16 bytes
+MAGIC = b"LTMB"
+# Subir al cambiar el formato del paquete (los cambios del arte ya cambian la clave de origen)
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<4sIII32s")
+ENTRY = struct.Struct("<IIQ")
+NAME_LENGTH = struct.Struct("<H")
+ALIGNMENT = 16
+
+# SVG de origen de cada imagen del juego
+SOURCES = {
+    'player': PLAYER_IMG,
+    'enemy': ENEMY_IMG,
+    'boss': BOSS_IMG,
+    'potion': POTION_IMG,
+    'power': POWER_IMG,
+    'stairs': STAIRS_IMG,
+    'wall': WALL_IMG,
+    'floor': FLOOR_IMG,
+}
+
+def source_key(renderer):
+    """
+    Huella de todo lo que determina las imágenes renderizadas
+
+    Incluye el contenido de los SVG, el código de la función que las
+    renderiza (con el arte procedimental), TILE_SIZE, la versión del paquete
+    y si está disponible cairosvg (sin él se usa el arte procedimental), de
+    modo que cualquier cambio obliga a volver a generar el paquete.
+
+    Args:
+        renderer: Función que renderiza las imágenes (render_images())
+    """
+    digest = hashlib.sha256()
+    backend = "cairosvg" if importlib.util.find_spec("cairosvg") else "fallback"
+    digest.update(f"{BUNDLE_VERSION}:{TILE_SIZE}:{backend}".encode())
+    try:
+        digest.update(inspect.getsource(renderer).encode())
+    except (OSError, TypeError):
+        # Sin código fuente disponible (p. ej. solo .pyc): usar el bytecode
+        digest.update(marshal.dumps(renderer.__code__))
+    for name in sorted(SOURCES):
+        digest.update(name.encode())
+        try:
+            with open(SOURCES[name], "rb") as source:
+                digest.update(source.read())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.digest()
+
+def save_asset_bundle(path, images, key):
+    """
+    Escribe las superficies de images en un único archivo binario
+
+    Args:
+        path: Ruta del paquete
+        images: Diccionario nombre -> pygame.Surface
+        key: Clave de origen (source_key())
+    """
+    names = sorted(images)
+    index_size = sum(NAME_LENGTH.size + len(name.encode()) + ENTRY.size for name in names)
+    offset = _align(HEADER.size + index_size)
+
+    index = bytearray()
+    pixels = []
+    for name in names:
+        surface = images[name]
+        data = pygame.image.tostring(surface, "RGBA")
+        encoded = name.encode()
+        index += NAME_LENGTH.pack(len(encoded)) + encoded
+        index += ENTRY.pack(surface.get_width(), surface.get_height(), offset)
+        pixels.append((offset, data))
+        offset = _align(offset + len(data))
+
+    # Escribir en un temporal y reemplazar, para no dejar nunca un paquete a medias
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as bundle:
+        bundle.write(HEADER.pack(MAGIC, BUNDLE_VERSION, TILE_SIZE, len(names), key))
+        bundle.write(index)
+        for data_offset, data in pixels:
+            bundle.write(b"\0" * (data_offset - bundle.tell()))
+            bundle.write(data)
+    os.replace(temp_path, path)
+
+def load_asset_bundle(path, key):
+    """
+    Carga las imágenes de un paquete proyectándolo en memoria
+
+    Las superficies se crean con pygame.image.frombuffer() directamente sobre
+    el mapa de memoria, sin decodificar ni copiar los píxeles. El mapa es de
+    copia en escritura, así que modificar una superficie no altera el archivo.
+
+    Args:
+        path: Ruta del paquete
+        key: Clave de origen esperada (source_key())
+
+    Returns:
+        Diccionario nombre -> pygame.Surface, o None si el paquete no existe,
+        está dañado o se generó a partir de otras fuentes
+    """
+    try:
+        with open(path, "rb") as bundle:
+            data = mmap.mmap(bundle.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    # Validar todo el índice antes de crear superficies, para poder cerrar el mapa si no sirve
+    entries = _read_index(data, key)
+    if entries is None:
+        data.close()
+        return None
+
+    view = memoryview(data)
+    return {
+        name: pygame.image.frombuffer(view[offset:offset + width * height * 4], (width, height), "RGBA")
+        for name, width, height, offset in entries
+    }
+
+def _read_index(data, key):
+    """Lista de (nombre, ancho, alto, desplazamiento) del paquete, o None si no es válido para key"""
+    try:
+        magic, version, tile_size, count, bundle_key = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != BUNDLE_VERSION or tile_size != TILE_SIZE or bundle_key != key:
+            return None
+
+        entries = []
+        position = HEADER.size
+        for _ in range(count):
+            (name_length,) = NAME_LENGTH.unpack_from(data, position)
+            position += NAME_LENGTH.size
+            name = bytes(data[position:position + name_length]).decode()
+            position += name_length
+            width, height, offset = ENTRY.unpack_from(data, position)
+            position += ENTRY.size
+            if offset + width * height * 4 > len(data):
+                return None
+            entries.append((name, width, height, offset))
+        return entries
+    except (struct.error, UnicodeDecodeError):
+        return None
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,94 @@
+import pygame
+from src.utils.constants import *
+
+# Ancho de la página del atlas en píxeles (las filas se apilan hacia abajo)
+ATLAS_WIDTH = 256
+
+class TextureAtlas:
+    """
+    Atlas de texturas: las imágenes del juego en dos superficies
+
+    pack() convierte las imágenes al formato de la pantalla una sola vez y
+    las reparte en dos páginas: las opacas (tiles de pared y suelo) en una
+    convertida con convert(), que se blittea como una copia sin mezcla, y
+    las que tienen transparencia (sprites) en otra con convert_alpha(). En
+    cada página se colocan con un empaquetado por estanterías: se ordenan
+    por altura y se van llenando filas de ATLAS_WIDTH píxeles. Cada imagen
+    se sustituye por una subsuperficie de su página, así que el resto del
+    código sigue blitteando superficies normales, y pages[nombre] con
+    rects[nombre] permite enviar varias a la vez con Surface.blits().
+    """
+    def __init__(self, width=ATLAS_WIDTH):
+        self.width = width
+        self.opaque_surface = None
+        self.alpha_surface = None
+        # Clave -> página que contiene la imagen y su rect dentro de ella
+        self.pages = {}
+        self.rects = {}
+
+    def pack(self, images):
+        """
+        Empaqueta images en el atlas
+
+        Args:
+            images: Diccionario clave -> pygame.Surface
+
+        Returns:
+            Diccionario con las mismas claves y subsuperficies del atlas
+        """
+        self.pages = {}
+        self.rects = {}
+        opaque = {key: image for key, image in images.items() if is_opaque(image)}
+        translucent = {key: image for key, image in images.items() if key not in opaque}
+        self.opaque_surface = self._pack_page(opaque, alpha=False)
+        self.alpha_surface = self._pack_page(translucent, alpha=True)
+
+        return {key: self.pages[key].subsurface(rect) for key, rect in self.rects.items()}
+
+    def _pack_page(self, images, alpha):
+        """Coloca images en una página nueva y la devuelve convertida (None si no hay imágenes)"""
+        if not images:
+            return None
+
+        # Colocar por estanterías, de la más alta a la más baja
+        order = sorted(images, key=lambda key: (-images[key].get_height(), -images[key].get_width()))
+        rects = {}
+        x = y = shelf_height = 0
+        for key in order:
+            width, height = images[key].get_size()
+            if x + width > self.width and x > 0:
+                y += shelf_height
+                x = shelf_height = 0
+            rects[key] = pygame.Rect(x, y, width, height)
+            x += width
+            shelf_height = max(shelf_height, height)
+
+        page = pygame.Surface((self.width, max(1, y + shelf_height)), pygame.SRCALPHA if alpha else 0)
+        for key, rect in rects.items():
+            page.blit(images[key], rect)
+        page = to_display_format(page, alpha=alpha)
+        for key, rect in rects.items():
+            self.pages[key] = page
+            self.rects[key] = rect
+        return page
+
+
+def is_opaque(surface):
+    """True si surface no tiene ningún píxel transparente ni translúcido"""
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return surface.get_colorkey() is None and surface.get_alpha() in (None, 255)
+    # Con canal alfa (p. ej. las cargadas del paquete de assets) hay que mirar los píxeles
+    alpha = pygame.image.tostring(surface, "RGBA")[3::4]
+    return alpha.count(255) == len(alpha)
+
+
+def to_display_format(surface, alpha=False):
+    """
+    Convierte surface al formato de píxel de la pantalla
+
+    Sin modo de vídeo (p. ej. en herramientas sin ventana) no hay formato al
+    que convertir y se devuelve la superficie tal cual.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
@@ -0,0 +1,57 @@
+import time
+import pygame
+from src.utils.constants import *
+
+class RealClock:
+    """Reloj de pared: los milisegundos de pygame y la hora del sistema"""
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def time(self):
+        return time.time()
+
+
+class SimClock:
+    """
+    Reloj simulado que solo avanza cuando se llama a advance()
+
+    Cada tick de la simulación dura step_ms milisegundos (un paso a SIM_RATE
+    por defecto), independientemente de lo que tarde en calcularse, así que la
+    simulación es reproducible y puede ir tan rápido como permita la CPU.
+    """
+    def __init__(self, step_ms=SIM_STEP_MS):
+        self.step_ms = step_ms
+        self.ticks = 0
+        self.elapsed_ms = 0.0
+
+    def advance(self, steps=1):
+        self.ticks += steps
+        self.elapsed_ms += steps * self.step_ms
+
+    def get_ticks(self):
+        return int(self.elapsed_ms)
+
+    def time(self):
+        return self.elapsed_ms / 1000
+
+
+# Reloj que usa todo el juego; set_clock() lo sustituye (p. ej. por un SimClock en modo headless)
+_clock = RealClock()
+
+def get_clock():
+    return _clock
+
+def set_clock(clock):
+    """Instala clock como reloj del juego y devuelve el anterior"""
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+def get_ticks():
+    """Milisegundos según el reloj del juego (como pygame.time.get_ticks())"""
+    return _clock.get_ticks()
+
+def now():
+    """Segundos según el reloj del juego (como time.time())"""
+    return _clock.time()
@@ -4,7 +4,12 @@
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 TITLE = "La Torre Maldita"
-FPS = 60
+FPS = 60  # Límite de frames renderizados por segundo
+SIM_RATE = 60  # Pasos de simulación por segundo, independientes de los frames renderizados
+SIM_STEP_MS = 1000 / SIM_RATE
+MAX_SIM_STEPS_PER_FRAME = 5  # Pasos de recuperación como máximo por frame; el retraso que sobre se descarta
+RENDER_INTERPOLATION = True  # Dibujar las entidades interpoladas entre los dos últimos pasos
+DIRTY_RECT_RENDERING = True  # Presentar solo los rectángulos cambiados en lugar de la pantalla completa
 
 # Colores
 BLACK = (0, 0, 0)
@@ -26,6 +31,21 @@ ENEMY_SPEED = 3
 ENEMY_SIZE = 32
 ENEMY_DETECTION_RADIUS = 150
 ENEMY_PATROL_RADIUS = 100
+VECTORIZE_MIN_ENEMIES = 24  # A partir de cuántos enemigos se actualizan todos a la vez con NumPy
+
+# Inteligencia artificial
+PATHFINDING_METHOD = "astar"  # "astar", "jps" (4 direcciones) o "jps8" (8 direcciones)
+PATH_CACHE_SIZE = 256  # Número máximo de caminos guardados en la caché LRU
+
+# Interfaz
+FONT_SIZES = (72, 48, 36, 20)  # Tamaños de fuente que se cargan al arrancar
+TEXT_CACHE_SIZE = 64  # Número máximo de textos renderizados guardados en la caché LRU
+PROFILER_HISTORY = 120  # Frames que guarda el perfilador (F3) para medias, percentiles e histograma
+PROFILER_REFRESH_FRAMES = 15  # Cada cuántos frames se actualiza el texto del perfilador
+PROFILER_HISTOGRAM_BINS = 24  # Intervalos del histograma de duración de frames (de 0 a dos frames a FPS)
+TRACE_BUFFER_SIZE = 50000  # Spans que guarda el trazador (F4) antes de descartar los más antiguos
+TRACE_ON_START = False  # Empezar a grabar la traza al arrancar en lugar de al pulsar F4
+TRACE_DIR = "traces"  # Carpeta donde se escriben las trazas JSON
 
 # Nivel
 TILE_SIZE = 32
@@ -34,6 +54,7 @@ ROOM_MIN_SIZE = 5
 ROOM_MAX_SIZE = 10
 MIN_ROOMS = 3
 MAX_ROOMS = 8
+PREFETCH_DEPTH = 1  # Pisos que se generan por adelantado en segundo plano (0 = al subir las escaleras)
 
 # Objetos
 POTION_HEAL = 25
@@ -54,6 +75,7 @@ FLOOR_IMG = f"{IMAGES_DIR}/floor.svg"
 STAIRS_IMG = f"{IMAGES_DIR}/stairs.svg"
 POTION_IMG = f"{IMAGES_DIR}/potion.svg"
 POWER_IMG = f"{IMAGES_DIR}/power.svg"
+ASSET_BUNDLE = f"{ASSETS_DIR}/images.bundle"  # Imágenes pre-renderizadas (se regenera si cambian las fuentes)
 
 # Sonidos
 STEP_SOUND = f"{SOUNDS_DIR}/step.wav"
@@ -0,0 +1,215 @@
+import time
+from collections import deque
+import pygame
+from src.utils.constants import *
+
+class _NullSection:
+    """Sección que no mide nada: la que se devuelve con el perfilador apagado"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SECTION = _NullSection()
+
+
+class _Section:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    Perfilador de frames con superposición en pantalla
+
+    El bucle principal llama a frame() una vez por frame; el código
+    instrumentado mide sus subsistemas con "with profiler.section(nombre):"
+    y suma contadores con count(). Además se pueden vigilar contadores
+    externos (p. ej. los de astar.stats) con watch(): al cerrar cada frame se
+    guarda cuánto han aumentado.
+
+    Con el perfilador apagado section() devuelve una sección nula compartida
+    y el resto de métodos vuelven nada más entrar, así que la
+    instrumentación cuesta poco más que una llamada.
+    """
+    def __init__(self, history=PROFILER_HISTORY):
+        self.enabled = False
+        self.history = history
+        self.frame_times = deque(maxlen=history)
+        # Nombre -> historial de milisegundos (secciones) o valores (contadores) por frame
+        self.section_times = {}
+        self.counters = {}
+        # Acumulados del frame en curso
+        self.frame_sections = {}
+        self.frame_counters = {}
+        # Contadores externos: [nombre, diccionario, clave, último valor]
+        self.watches = []
+        self.frame_start = None
+
+        # Texto de la superposición (se refresca cada pocos frames para poder leerlo)
+        self.lines = []
+        self.frames_since_refresh = 0
+        self.panel = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = None
+        self.frame_times.clear()
+        self.section_times.clear()
+        self.counters.clear()
+        self.frame_sections.clear()
+        self.frame_counters.clear()
+        self.lines = []
+        for watch in self.watches:
+            watch[3] = watch[1][watch[2]]
+
+    def watch(self, name, source, key):
+        """Vigila source[key] y registra en name cuánto aumenta en cada frame"""
+        self.watches = [watch for watch in self.watches if watch[0] != name]
+        self.watches.append([name, source, key, source[key]])
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        return _Section(self, name)
+
+    def add_time(self, name, seconds):
+        self.frame_sections[name] = self.frame_sections.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.frame_counters[name] = self.frame_counters.get(name, 0) + amount
+
+    def frame(self):
+        """Cierra el frame anterior (guardando sus tiempos y contadores) y abre uno nuevo"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frame_times.append((now - self.frame_start) * 1000)
+            for name in self.section_times.keys() | self.frame_sections.keys():
+                self._history(self.section_times, name).append(self.frame_sections.get(name, 0.0) * 1000)
+            for watch in self.watches:
+                value = watch[1][watch[2]]
+                self.frame_counters[watch[0]] = value - watch[3]
+                watch[3] = value
+            for name in self.counters.keys() | self.frame_counters.keys():
+                self._history(self.counters, name).append(self.frame_counters.get(name, 0))
+            self.frames_since_refresh += 1
+        self.frame_sections.clear()
+        self.frame_counters.clear()
+        self.frame_start = now
+
+    def _history(self, histories, name):
+        history = histories.get(name)
+        if history is None:
+            history = histories[name] = deque(maxlen=self.history)
+        return history
+
+    def histogram(self, bins=PROFILER_HISTOGRAM_BINS, limit=None):
+        """
+        Reparte la duración de los frames recientes en intervalos fijos
+
+        Args:
+            bins: Número de intervalos entre 0 y limit
+            limit: Duración en milisegundos que cubren los intervalos (por
+                defecto dos frames a FPS); los frames más largos van al último
+
+        Returns:
+            Lista con el número de frames de cada intervalo
+        """
+        if limit is None:
+            limit = 2000 / FPS
+        counts = [0] * bins
+        for frame_time in self.frame_times:
+            counts[min(bins - 1, int(frame_time * bins / limit))] += 1
+        return counts
+
+    def percentile(self, fraction):
+        """Percentil de la duración de los frames recientes, en milisegundos"""
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        """Líneas de texto con los percentiles, las medias por sección y los contadores"""
+        if not self.frame_times:
+            return ["Perfilador: midiendo..."]
+        average = sum(self.frame_times) / len(self.frame_times)
+        lines = [
+            f"FPS {1000 / average:.1f}  frame p50 {self.percentile(0.5):.1f}  "
+            f"p95 {self.percentile(0.95):.1f}  p99 {self.percentile(0.99):.1f} ms"
+        ]
+        for name, times in sorted(self.section_times.items()):
+            lines.append(f"{name}: {sum(times) / len(times):.2f} ms (máx {max(times):.2f})")
+        counters = [f"{name} {sum(values) / len(values):.1f}" for name, values in sorted(self.counters.items())]
+        for start in range(0, len(counters), 3):
+            lines.append("  ".join(counters[start:start + 3]))
+        return lines
+
+    def draw(self, screen, text_cache):
+        """
+        Dibuja la superposición en la esquina inferior izquierda
+
+        Returns:
+            pygame.Rect con la zona dibujada
+        """
+        if not self.lines or self.frames_since_refresh >= PROFILER_REFRESH_FRAMES:
+            self.lines = self.summary()
+            self.frames_since_refresh = 0
+
+        font = text_cache.font(20)
+        line_height = font.get_linesize()
+        graph_height = 50
+        graph_width = max(self.history * 2, 320)
+        width = graph_width + 20
+        height = len(self.lines) * line_height + graph_height + 30
+        panel_rect = pygame.Rect(10, SCREEN_HEIGHT - height - 10, width, height)
+
+        # Fondo semitransparente, creado de nuevo solo si cambia de tamaño
+        if self.panel is None or self.panel.get_size() != panel_rect.size:
+            self.panel = pygame.Surface(panel_rect.size, pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 180))
+        screen.blit(self.panel, panel_rect)
+
+        # Texto (con glifos cacheados: los números cambian continuamente)
+        y = panel_rect.y + 8
+        for line in self.lines:
+            text_cache.blit_glyphs(screen, line, font, WHITE, (panel_rect.x + 10, y))
+            y += line_height
+
+        # Histograma de los últimos frames: de izquierda a derecha, de 0 ms a dos frames a FPS (el
+        # último intervalo recoge también los más lentos); la altura es la fracción de frames
+        graph_bottom = panel_rect.bottom - 10
+        budget = 1000 / FPS
+        counts = self.histogram(PROFILER_HISTOGRAM_BINS, 2 * budget)
+        tallest = max(counts)
+        bin_width = graph_width // PROFILER_HISTOGRAM_BINS
+        if tallest:
+            for index, count in enumerate(counts):
+                bar_height = count * graph_height // tallest
+                # Rojo a partir del intervalo que empieza más allá del presupuesto
+                color = GREEN if index * 2 * budget / PROFILER_HISTOGRAM_BINS < budget * 1.1 else RED
+                screen.fill(color, (panel_rect.x + 10 + index * bin_width, graph_bottom - bar_height,
+                                    bin_width - 1, bar_height))
+        # Línea vertical del presupuesto de un frame a FPS (mitad del eje)
+        budget_x = panel_rect.x + 10 + bin_width * PROFILER_HISTOGRAM_BINS // 2
+        screen.fill(WHITE, (budget_x, graph_bottom - graph_height, 1, graph_height))
+        return panel_rect
+
+
+# Perfilador compartido por el bucle principal y el juego
+profiler = Profiler()
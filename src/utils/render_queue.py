@@ -0,0 +1,57 @@
+from src.utils.constants import *
+
+# Capas de dibujado del mundo, de abajo arriba
+LAYER_ITEMS = 0
+LAYER_ENEMIES = 1
+LAYER_PLAYER = 2
+
+class RenderQueue:
+    """
+    Cola de dibujado de un frame
+
+    Los métodos draw() de las entidades no dibujan directamente: añaden sus
+    sprites con add() y la cola los envía todos juntos en flush(), ordenados
+    por capa, con una sola llamada a Surface.blits(). Dentro de una capa se
+    respeta el orden en que se añadieron (p. ej. la barra de salud de un
+    enemigo sobre su sprite).
+
+    Los rectángulos de color (add_fill) se mantienen para los dibujos de
+    reserva sin imagen; parten el lote en tramos pero conservan el orden.
+    """
+    def __init__(self):
+        self.entries = []
+
+    def add(self, surface, pos, area=None, layer=0):
+        """Encola un blit de surface en pos (opcionalmente solo el área area)"""
+        self.entries.append((layer, surface, pos, area))
+
+    def add_fill(self, rect, color, layer=0):
+        """Encola el relleno de rect con color"""
+        self.entries.append((layer, None, rect, color))
+
+    def flush(self, target):
+        """
+        Dibuja en target todo lo encolado y vacía la cola
+
+        Returns:
+            Número de entradas dibujadas
+        """
+        entries = self.entries
+        # sort() es estable: dentro de cada capa se mantiene el orden de llegada
+        entries.sort(key=lambda entry: entry[0])
+
+        batch = []
+        for _, surface, pos, area in entries:
+            if surface is None:
+                if batch:
+                    target.blits(batch, doreturn=False)
+                    batch = []
+                target.fill(area, pos)
+            else:
+                batch.append((surface, pos, area))
+        if batch:
+            target.blits(batch, doreturn=False)
+
+        count = len(entries)
+        self.entries = []
+        return count
@@ -0,0 +1,101 @@
+from src.utils.constants import *
+
+class SpatialHash:
+    """
+    Rejilla uniforme para consultas de colisión de fase amplia
+
+    Cada objeto se registra en las celdas (de cell_size píxeles) que cubre su
+    rectángulo, opcionalmente con una capa ("enemies", "items", ...). Una
+    consulta devuelve los objetos de las celdas que toca el rectángulo
+    consultado, de modo que el coste depende de la densidad local y no del
+    número total de objetos. La comprobación exacta (colliderect) la hace
+    quien consulta.
+
+    Los objetos se identifican por id(), así que también valen diccionarios.
+    """
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        # (celda_x, celda_y) -> {id(obj): obj}
+        self.cells = {}
+        # id(obj) -> (obj, capa, límites de celdas)
+        self.entries = {}
+
+    def _bounds(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, obj, rect, layer=None):
+        """Registra obj con el rectángulo rect (o lo mueve si ya estaba)"""
+        if id(obj) in self.entries:
+            self.update(obj, rect)
+            return
+        bounds = self._bounds(rect)
+        self.entries[id(obj)] = (obj, layer, bounds)
+        self._add_to_cells(obj, bounds)
+
+    def update(self, obj, rect):
+        """Actualiza las celdas de obj; no hace nada si no ha cambiado de celdas"""
+        entry = self.entries.get(id(obj))
+        if entry is None:
+            return
+        bounds = self._bounds(rect)
+        if bounds == entry[2]:
+            return
+        self._remove_from_cells(obj, entry[2])
+        self.entries[id(obj)] = (obj, entry[1], bounds)
+        self._add_to_cells(obj, bounds)
+
+    def remove(self, obj):
+        entry = self.entries.pop(id(obj), None)
+        if entry is not None:
+            self._remove_from_cells(obj, entry[2])
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def query(self, rect, layer=None):
+        """
+        Devuelve los objetos cuyas celdas se solapan con rect
+
+        Args:
+            rect: pygame.Rect a consultar
+            layer: Si se indica, solo se devuelven objetos de esa capa
+
+        Returns:
+            Lista de candidatos sin repetidos (pueden no colisionar exactamente)
+        """
+        x1, y1, x2, y2 = self._bounds(rect)
+        cells = self.cells
+        entries = self.entries
+        found = {}
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        if layer is None:
+            return list(found.values())
+        return [obj for key, obj in found.items() if entries[key][1] == layer]
+
+    def _add_to_cells(self, obj, bounds):
+        x1, y1, x2, y2 = bounds
+        key = id(obj)
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[(cx, cy)] = {}
+                cell[key] = obj
+
+    def _remove_from_cells(self, obj, bounds):
+        x1, y1, x2, y2 = bounds
+        key = id(obj)
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    cell.pop(key, None)
+                    if not cell:
+                        del self.cells[(cx, cy)]
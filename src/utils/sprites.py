@@ -0,0 +1,75 @@
+import pygame
+from src.utils.atlas import to_display_format
+from src.utils.constants import *
+
+# Tinte azul del jugador con el poder activo
+POWER_TINT = (0, 100, 255, 128)
+
+# Tamaño en píxeles del sprite del jefe
+BOSS_SIZE = int(ENEMY_SIZE * 1.5)
+
+class SpriteVariants:
+    """
+    Variantes precalculadas de las imágenes del juego por (entidad, estado)
+
+    Se construye una sola vez al cargar las imágenes: cada imagen está como
+    variante "normal" y además se preparan las que antes se calculaban en
+    cada frame (el jefe escalado a su tamaño y el jugador tintado de azul con
+    el poder activo). Así los métodos draw() solo eligen la superficie y la
+    dibujan, sin copiar ni transformar nada.
+    """
+    def __init__(self, images):
+        self.variants = {}
+        if not images:
+            return
+
+        for name, image in images.items():
+            self.variants[(name, "normal")] = image
+
+        player = images.get('player')
+        if player is not None:
+            self.variants[('player', "power")] = tint(player, POWER_TINT)
+
+        boss = images.get('boss')
+        if boss is not None:
+            self.variants[('boss', "normal")] = pygame.transform.scale(boss, (BOSS_SIZE, BOSS_SIZE))
+
+    def get(self, entity, state="normal"):
+        """Devuelve la variante pedida o None si no hay imagen para ella"""
+        return self.variants.get((entity, state))
+
+
+# Segmentos pre-renderizados (barras de salud, contornos) por sus parámetros
+_segments = {}
+
+def health_bar(width):
+    """
+    Segmentos de una barra de salud de width píxeles
+
+    Returns:
+        Tupla (fondo rojo, relleno verde); el relleno se dibuja recortado con
+        un área de anchura proporcional a la salud
+    """
+    key = ('health_bar', width)
+    if key not in _segments:
+        empty = pygame.Surface((width, 5))
+        empty.fill(RED)
+        full = pygame.Surface((width, 5))
+        full.fill(GREEN)
+        _segments[key] = (to_display_format(empty), to_display_format(full))
+    return _segments[key]
+
+def outline(size, color, thickness):
+    """Contorno de un rectángulo de size píxeles, transparente por dentro"""
+    key = ('outline', size, color, thickness)
+    if key not in _segments:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, surface.get_rect(), thickness)
+        _segments[key] = to_display_format(surface, alpha=True)
+    return _segments[key]
+
+def tint(image, color):
+    """Devuelve una copia de image multiplicada por color (RGBA)"""
+    tinted = image.copy()
+    tinted.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+    return tinted
@@ -0,0 +1,173 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from src.utils.constants import *
+
+class _NullSpan:
+    """Span que no registra nada: el que se devuelve con el trazador apagado"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.tracer.record(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Trazador de spans con búfer circular y exportación a formato Chrome trace
+
+    A diferencia del perfilador (que promedia), guarda cada span por separado
+    (nombre, categoría, inicio, duración e hilo) para poder ver frame a frame
+    en un visor de líneas de tiempo (chrome://tracing, Perfetto) qué ha
+    pasado en un tirón concreto. Solo se guardan los últimos capacity
+    eventos, así que puede quedarse grabando toda la partida.
+
+    Con el trazador apagado span() devuelve un span nulo compartido.
+    """
+    def __init__(self, capacity=TRACE_BUFFER_SIZE):
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+        self.origin = time.perf_counter()
+        self.frame_start = None
+        # Identificador de hilo -> nombre, para etiquetar las filas del visor
+        self.threads = {}
+        # El hilo de pisos por adelantado también registra spans: record() y la exportación
+        # no deben pisarse
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.enabled = True
+        self.frame_start = None
+
+    def stop(self):
+        self.enabled = False
+
+    def clear(self):
+        with self.lock:
+            self.events.clear()
+        self.frame_start = None
+
+    def span(self, name, category="game", **args):
+        """Context manager que registra lo que tarda su bloque"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, category, args or None)
+
+    def traced(self, name, category="game"):
+        """Decorador que registra cada llamada a la función como un span"""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, category, start, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def record(self, name, category, start, duration, args=None):
+        """Guarda un span que empezó en start (segundos de perf_counter) y duró duration segundos"""
+        thread = threading.get_ident()
+        with self.lock:
+            if thread not in self.threads:
+                self.threads[thread] = threading.current_thread().name
+            self.events.append((name, category, start, duration, thread, args))
+
+    def instant(self, name, category="game", **args):
+        """Registra un evento sin duración (p. ej. un cambio de piso)"""
+        if self.enabled:
+            self.record(name, category, time.perf_counter(), None, args or None)
+
+    def frame(self):
+        """Cierra el frame anterior como un span "frame" y abre uno nuevo; se llama una vez por frame"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.record("frame", "frame", self.frame_start, now - self.frame_start)
+        self.frame_start = now
+
+    def to_chrome_trace(self):
+        """
+        Convierte el búfer al formato JSON de eventos de traza de Chrome
+
+        Returns:
+            Diccionario listo para json.dump()
+        """
+        # Copias tomadas de una vez: otro hilo puede seguir registrando mientras se exporta
+        with self.lock:
+            threads = list(self.threads.items())
+            events = list(self.events)
+
+        pid = os.getpid()
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread, 'args': {'name': name}}
+            for thread, name in threads
+        ]
+        for name, category, start, duration, thread, args in events:
+            event = {
+                'name': name,
+                'cat': category,
+                'pid': pid,
+                'tid': thread,
+                'ts': (start - self.origin) * 1e6,
+            }
+            if duration is None:
+                event['ph'] = 'i'
+                event['s'] = 't'
+            else:
+                event['ph'] = 'X'
+                event['dur'] = duration * 1e6
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path=None):
+        """
+        Escribe el búfer en un JSON de traza
+
+        Args:
+            path: Archivo de destino; por defecto uno con fecha y hora en TRACE_DIR
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        with open(path, "w") as output:
+            json.dump(self.to_chrome_trace(), output)
+        print(f"Trace: {len(self.events)} events written to {path}")
+        return path
+
+
+# Trazador compartido por el bucle principal, el juego y la IA
+tracer = Tracer()